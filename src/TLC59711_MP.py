@@ -1,6 +1,20 @@
 import struct
+import json
+from array import array
 from machine import Pin, SPI
 import time
+from fixedpoint import (
+    percent_to_u16,
+    u16_to_percent,
+    dimming_table,
+    CURVE_LINEAR,
+    CURVE_CIE1931,
+)
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
 
 # Constants
 _CHIP_BUFFER_BYTE_COUNT = 28
@@ -36,12 +50,29 @@ WRITE_COMMAND = 0b100101
 
 _CHIP_BUFFER_HEADER_BIT_COUNT = _WC_BIT_COUNT + _FC_BIT_COUNT + _BC_BIT_COUNT
 _CHIP_BUFFER_HEADER_BYTE_COUNT = _CHIP_BUFFER_HEADER_BIT_COUNT // 8
+_BC_HEADER_MASK = ((1 << _BC_BIT_COUNT) - 1) << _BC_CHIP_BUFFER_BIT_OFFSET
+
+
+def _header_word(bcr, bcg, bcb, outtmg, extgck, tmgrst, dsprpt, blank):
+    """Assemble the complete 32-bit chip header from BC, FC and WRITE_COMMAND."""
+    word = 0
+    for name, value in (("BCR", bcr), ("BCG", bcg), ("BCB", bcb)):
+        field = _BC_FIELDS[name]
+        word |= (value & field["mask"]) << (_BC_CHIP_BUFFER_BIT_OFFSET + field["offset"])
+    for name, value in (("OUTTMG", outtmg), ("EXTGCK", extgck), ("TMGRST", tmgrst),
+                        ("DSPRPT", dsprpt), ("BLANK", blank)):
+        field = _FC_FIELDS[name]
+        word |= (1 if value else 0) << (_FC_CHIP_BUFFER_BIT_OFFSET + field["offset"])
+    field = _WC_FIELDS["WRITE_COMMAND"]
+    word |= (WRITE_COMMAND & field["mask"]) << (_WC_CHIP_BUFFER_BIT_OFFSET + field["offset"])
+    return word
 
 
 class TLC59711:
     """TLC5971 & TLC59711 16-bit 12 channel LED PWM driver."""
 
-    def __init__(self, pixel_count=4, spi_id=0, sck_pin=2, mosi_pin=3):
+    def __init__(self, pixel_count=4, spi_id=0, sck_pin=2, mosi_pin=3, chip_count=None,
+                 double_buffered=False):
         """Initialize the TLC59711 driver.
         
         Args:
@@ -49,6 +80,10 @@ class TLC59711:
             spi_id: SPI bus ID (0 or 1 for RP2040)
             sck_pin: SCK pin number
             mosi_pin: MOSI pin number
+            chip_count: Number of chips in the daisy chain (default: enough
+                chips for pixel_count)
+            double_buffered: Transmit frames from a background thread so
+                show() returns while the previous frame is shifting out
         """
         # Initialize SPI - TLC59711 only needs SCK and MOSI
         self._spi = SPI(spi_id, 
@@ -60,7 +95,11 @@ class TLC59711:
         
         self.pixel_count = pixel_count
         self.channel_count = self.pixel_count * COLORS_PER_PIXEL
-        self.chip_count = self.pixel_count // LEDS_PER_CHIP
+        if chip_count is None:
+            chip_count = (self.pixel_count + LEDS_PER_CHIP - 1) // LEDS_PER_CHIP
+        if chip_count * LEDS_PER_CHIP < self.pixel_count:
+            raise ValueError(f"{chip_count} chips cannot drive {self.pixel_count} pixels")
+        self.chip_count = chip_count
         self._buffer = bytearray(_CHIP_BUFFER_BYTE_COUNT * self.chip_count)
 
         self.bcr = 127
@@ -73,15 +112,93 @@ class TLC59711:
         self.dsprpt = True
         self.blank = False
 
+        # Header word cached against the settings it was built from
+        self._header_key = None
+        self._header = 0
+        # Per-chip BC bits overriding bcr/bcg/bcb, or None to follow them
+        self._chip_bc = [None] * self.chip_count
+
         self._init_buffer()
         self._buffer_LED_index_lookuptable = []
         self._init_LED_lookuptable()
+        self._init_channel_offsets()
+
+        # name -> (channels, buffer offsets)
+        self._groups = {}
+
+        # Level -> 16-bit PWM lookup, built by set_dimming_curve
+        self._dimming = None
+
+        # Copy of the last transmitted frame; show() skips identical frames
+        self._sent = None
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+        # Double buffering: show() snapshots _buffer into _front and the
+        # worker on the other core shifts it out
+        self._front = None
+        self._tx_pending = False
+        self._tx_stop = False
+        self._tx_running = False
+        if double_buffered:
+            self._start_worker()
+
+    def _start_worker(self):
+        if _thread is None:
+            return
+        self._front = bytearray(len(self._buffer))
+        self._tx_running = True
+        try:
+            _thread.start_new_thread(self._tx_worker, ())
+        except (OSError, RuntimeError):
+            # Core already in use: stay synchronous
+            self._front = None
+            self._tx_running = False
+
+    def _tx_worker(self):
+        while not self._tx_stop:
+            if self._tx_pending:
+                self._spi.write(self._front)
+                self._tx_pending = False
+            else:
+                time.sleep_us(100)
+        self._tx_running = False
+
+    @property
+    def double_buffered(self):
+        """True if frames are transmitted in the background."""
+        return self._front is not None
+
+    @property
+    def busy(self):
+        """True while a frame handed over by show() is still being sent."""
+        return self._tx_pending
+
+    def wait(self):
+        """Block until the frame handed over by show() has been sent."""
+        while self._tx_pending:
+            time.sleep_us(50)
 
     def _init_buffer(self):
+        self._stamp_headers()
+
+    def _chip_header(self):
+        """Return the header word for the current settings, rebuilding it on change."""
+        key = (self.bcr, self.bcg, self.bcb,
+               self.outtmg, self.extgck, self.tmgrst, self.dsprpt, self.blank)
+        if key != self._header_key:
+            self._header = _header_word(*key)
+            self._header_key = key
+        return self._header
+
+    def _stamp_headers(self):
+        """Write the current header word into every chip with one pack per chip."""
+        header = self._chip_header()
+        base = header & ~_BC_HEADER_MASK
         for chip_index in range(self.chip_count):
-            self.chip_set_BCData(chip_index, bcr=self.bcr, bcg=self.bcg, bcb=self.bcb)
-            self._chip_set_FunctionControl(chip_index)
-            self._chip_set_WriteCommand(chip_index)
+            bc = self._chip_bc[chip_index]
+            struct.pack_into(">I", self._buffer, chip_index * _CHIP_BUFFER_BYTE_COUNT,
+                             header if bc is None else base | bc)
 
     def set_chipheader_bits_in_buffer(self, chip_index=0, part_bit_offset=0, 
                                      field=None, value=0):
@@ -100,29 +217,13 @@ class TLC59711:
 
     def chip_set_BCData(self, chip_index, bcr=127, bcg=127, bcb=127):
         """Set BC-Data."""
-        self.set_chipheader_bits_in_buffer(
-            chip_index=chip_index,
-            part_bit_offset=_BC_CHIP_BUFFER_BIT_OFFSET,
-            field=_BC_FIELDS["BCR"],
-            value=bcr,
-        )
-        self.set_chipheader_bits_in_buffer(
-            chip_index=chip_index,
-            part_bit_offset=_BC_CHIP_BUFFER_BIT_OFFSET,
-            field=_BC_FIELDS["BCG"],
-            value=bcg,
-        )
-        self.set_chipheader_bits_in_buffer(
-            chip_index=chip_index,
-            part_bit_offset=_BC_CHIP_BUFFER_BIT_OFFSET,
-            field=_BC_FIELDS["BCB"],
-            value=bcb,
-        )
+        header = _header_word(bcr, bcg, bcb, self.outtmg, self.extgck,
+                              self.tmgrst, self.dsprpt, self.blank)
+        struct.pack_into(">I", self._buffer, chip_index * _CHIP_BUFFER_BYTE_COUNT, header)
 
     def update_BCData(self):
         """Update BC-Data for all Chips in Buffer."""
-        for chip_index in range(self.chip_count):
-            self.chip_set_BCData(chip_index, bcr=self.bcr, bcg=self.bcg, bcb=self.bcb)
+        self._stamp_headers()
 
     def set_brightness(self, bcr, bcg, bcb):
         """Set global brightness control for red, green, and blue."""
@@ -132,6 +233,31 @@ class TLC59711:
         self.update_BCData()
         self.show()
 
+    def set_chip_brightness(self, chip_index, bcr=None, bcg=None, bcb=None):
+        """Set brightness control for one chip, overriding set_brightness.
+
+        chip_index counts along the channels: chip 0 drives channels 0-11,
+        chip 1 channels 12-23 and so on. Call with no values to make the
+        chip follow the global brightness again.
+        """
+        if not (0 <= chip_index < self.chip_count):
+            raise IndexError(f"chip_index {chip_index} out of range (0..{self.chip_count-1})")
+        # Channel 0 sits in the last chip of the buffer
+        buffer_chip = (self.chip_count - 1) - chip_index
+        if bcr is None and bcg is None and bcb is None:
+            self._chip_bc[buffer_chip] = None
+        else:
+            bc = _header_word(self.bcr if bcr is None else bcr,
+                              self.bcg if bcg is None else bcg,
+                              self.bcb if bcb is None else bcb,
+                              False, False, False, False, False)
+            self._chip_bc[buffer_chip] = bc & _BC_HEADER_MASK
+        header = self._chip_header()
+        bc = self._chip_bc[buffer_chip]
+        if bc is not None:
+            header = (header & ~_BC_HEADER_MASK) | bc
+        struct.pack_into(">I", self._buffer, buffer_chip * _CHIP_BUFFER_BYTE_COUNT, header)
+
     def _chip_set_FunctionControl(self, chip_index):
         """Set Function Control Bits in Buffer."""
         self.set_chipheader_bits_in_buffer(
@@ -167,8 +293,7 @@ class TLC59711:
 
     def update_fc(self):
         """Update Function Control Bits for all Chips in Buffer."""
-        for chip_index in range(self.chip_count):
-            self._chip_set_FunctionControl(chip_index)
+        self._stamp_headers()
 
     def _chip_set_WriteCommand(self, chip_index):
         """Set WRITE_COMMAND."""
@@ -180,7 +305,9 @@ class TLC59711:
         )
 
     def _init_LED_lookuptable(self):
-        for channel_index in range(self.channel_count):
+        # Cover every channel of the chain so the reversal below lines up
+        # with the chips even when the last one is only partly used
+        for channel_index in range(self.chip_count * CHANNEL_PER_CHIP):
             buffer_index = (_CHIP_BUFFER_BYTE_COUNT // _BUFFER_BYTES_PER_COLOR) * (
                 channel_index // CHANNEL_PER_CHIP
             ) + channel_index % CHANNEL_PER_CHIP
@@ -188,12 +315,40 @@ class TLC59711:
             buffer_index += _CHIP_BUFFER_HEADER_BYTE_COUNT
             self._buffer_LED_index_lookuptable.append(buffer_index)
 
-    def _write(self):
-        self._spi.write(self._buffer)
+    def _init_channel_offsets(self):
+        # Channel 0 is the last one shifted out, so the lookup table is read
+        # backwards. Bake that into a forward channel -> buffer offset table.
+        chain_channels = self.chip_count * CHANNEL_PER_CHIP
+        self._channel_offsets = array("H", [0] * self.channel_count)
+        for channel_index in range(self.channel_count):
+            self._channel_offsets[channel_index] = self._buffer_LED_index_lookuptable[
+                (chain_channels - 1) - channel_index
+            ]
 
-    def show(self):
-        """Write out the current LED PWM state to the chip."""
+    def _write(self):
+        if self._front is None:
+            self._spi.write(self._buffer)
+            return
+        # Never touch _front while the worker is still sending it
+        self.wait()
+        self._front[:] = self._buffer
+        self._tx_pending = True
+
+    def show(self, force=False):
+        """Write out the current LED PWM state to the chip.
+
+        Nothing is sent if the frame matches the last one transmitted,
+        unless force is True.
+        """
+        if not force and self._buffer == self._sent:
+            self.frames_skipped += 1
+            return
         self._write()
+        if self._sent is None:
+            self._sent = bytearray(self._buffer)
+        else:
+            self._sent[:] = self._buffer
+        self.frames_sent += 1
 
     def set_all(self, brightness):
         """Set the normalized R, G, B values for all pixels."""
@@ -207,14 +362,124 @@ class TLC59711:
 
     def set_channel(self, channel_index, value):
         """Set a single channel's value (0-100%)."""
-        value = int(value * 655.35)
+        if isinstance(value, int):
+            value = percent_to_u16(value)
+        else:
+            value = int(value * 655.35)
+        if not (0 <= channel_index < self.channel_count):
+            raise IndexError(f"channel_index {channel_index} out of range (0..{self.channel_count})")
+        if not 0 <= value <= 65535:
+            raise ValueError(f"value {value} not in range: 0..65535")
+        struct.pack_into(">H", self._buffer, self._channel_offsets[channel_index], value)
+
+    def set_channel_raw(self, channel_index, value):
+        """Set a single channel's raw 16-bit PWM value (0-65535)."""
         if not (0 <= channel_index < self.channel_count):
             raise IndexError(f"channel_index {channel_index} out of range (0..{self.channel_count})")
         if not 0 <= value <= 65535:
             raise ValueError(f"value {value} not in range: 0..65535")
-        struct.pack_into(">H", self._buffer, 
-                        self._buffer_LED_index_lookuptable[(self.channel_count-1)-channel_index], 
-                        value)
+        offset = self._channel_offsets[channel_index]
+        self._buffer[offset] = value >> 8
+        self._buffer[offset + 1] = value & 0xFF
+
+    def get_channel_raw(self, channel_index):
+        """Get a single channel's raw 16-bit PWM value."""
+        if not (0 <= channel_index < self.channel_count):
+            raise IndexError(f"channel_index {channel_index} out of range (0..{self.channel_count-1})")
+        offset = self._channel_offsets[channel_index]
+        return (self._buffer[offset] << 8) | self._buffer[offset + 1]
+
+    def set_dimming_curve(self, curve=CURVE_CIE1931, size=1024):
+        """Precompute the dimming curve used by dim() and set_channel_level().
+
+        Args:
+            curve: fixedpoint.CURVE_LINEAR, CURVE_GAMMA22 or CURVE_CIE1931
+            size: Number of input levels, 1024 to index by a raw 10-bit
+                ADC reading
+        """
+        self._dimming = dimming_table(curve, size)
+
+    def dim(self, level):
+        """Return the 16-bit PWM value for a level on the dimming curve."""
+        if self._dimming is None:
+            self.set_dimming_curve(CURVE_LINEAR)
+        return self._dimming[level]
+
+    def set_channel_level(self, channel_index, level):
+        """Set a channel from a level (e.g. 0-1023) through the dimming curve."""
+        self.set_channel_raw(channel_index, self.dim(level))
+
+    def define_group(self, name, channels):
+        """Define a named group of channels, e.g. all channels of one fixture."""
+        channels = tuple(channels)
+        offsets = array("H", [0] * len(channels))
+        for i, channel_index in enumerate(channels):
+            if not (0 <= channel_index < self.channel_count):
+                raise IndexError(f"channel_index {channel_index} out of range (0..{self.channel_count-1})")
+            offsets[i] = self._channel_offsets[channel_index]
+        self._groups[name] = (channels, offsets)
+
+    def load_groups(self, config):
+        """Define groups from a {name: [channels]} dict or a JSON file of one."""
+        if isinstance(config, str):
+            with open(config) as f:
+                config = json.load(f)
+        for name, channels in config.items():
+            self.define_group(name, channels)
+
+    def groups(self):
+        """Return the names of the defined groups."""
+        return self._groups.keys()
+
+    def group(self, name):
+        """Return the channels of a named group, e.g. for set_channels()."""
+        return self._groups[name][0]
+
+    def set_group(self, name, value):
+        """Set every channel of a named group to one raw 16-bit value."""
+        if not 0 <= value <= 65535:
+            raise ValueError(f"value {value} not in range: 0..65535")
+        buffer = self._buffer
+        high = value >> 8
+        low = value & 0xFF
+        for offset in self._groups[name][1]:
+            buffer[offset] = high
+            buffer[offset + 1] = low
+
+    def set_group_level(self, name, level):
+        """Set a named group from a level (e.g. 0-1023) through the dimming curve."""
+        self.set_group(name, self.dim(level))
+
+    def set_channels(self, values, channels=None):
+        """Load raw 16-bit PWM values (0-65535) for many channels at once.
+
+        Args:
+            values: One value per channel, e.g. an array('H') or memoryview,
+                indexed by channel number
+            channels: Optional sequence of channel numbers to write, e.g. a
+                tuple, an array('H') or group(name). All channels are
+                written if None.
+        """
+        if len(values) < self.channel_count:
+            raise ValueError(f"expected {self.channel_count} values, got {len(values)}")
+        buffer = self._buffer
+        offsets = self._channel_offsets
+        if channels is None:
+            for channel_index in range(self.channel_count):
+                offset = offsets[channel_index]
+                value = values[channel_index]
+                buffer[offset] = value >> 8
+                buffer[offset + 1] = value & 0xFF
+            return
+        for channel_index in channels:
+            offset = offsets[channel_index]
+            value = values[channel_index]
+            buffer[offset] = value >> 8
+            buffer[offset + 1] = value & 0xFF
+
+    def load_frame(self, frame):
+        """Load a whole frame of raw 16-bit PWM values, one per channel."""
+        self.set_channels(frame)
 
     def __setitem__(self, channel_index, value):
         self.set_channel(channel_index, value)
@@ -224,14 +489,20 @@ class TLC59711:
         if not (0 <= channel_index < self.channel_count):
             raise IndexError(f"channel_index {channel_index} out of range (0..{self.channel_count-1})")
 
-        buffer_index = self._buffer_LED_index_lookuptable[(self.channel_count - 1) - channel_index]
+        buffer_index = self._channel_offsets[channel_index]
         value = struct.unpack_from(">H", self._buffer, buffer_index)[0]
         
         # Return as a normalized percentage (0-100%)
-        return round(value / 655.35)
+        return u16_to_percent(value)
 
     def deinit(self):
         """Clean up SPI resources."""
+        if self._front is not None:
+            self.wait()
+            self._tx_stop = True
+            while self._tx_running:
+                time.sleep_us(100)
+            self._front = None
         self._spi.deinit()
 
 
@@ -280,6 +551,27 @@ def flash_all(tlc, brightness, cycle_time):
         print("Flash All stopped.")
 
 
+def benchmark_show(chip_counts=(1, 2, 4, 8, 16, 32, 64), repeat=20, spi_id=0, sck_pin=2, mosi_pin=3):
+    """Print the cost of load_frame() and show() against chain length."""
+    for chip_count in chip_counts:
+        tlc = TLC59711(pixel_count=chip_count * LEDS_PER_CHIP, spi_id=spi_id,
+                       sck_pin=sck_pin, mosi_pin=mosi_pin, chip_count=chip_count)
+        frame = array("H", range(0, 65535, 65535 // tlc.channel_count))[:tlc.channel_count]
+        start = time.ticks_us()
+        for _ in range(repeat):
+            tlc.load_frame(frame)
+        load_us = time.ticks_diff(time.ticks_us(), start) // repeat
+        start = time.ticks_us()
+        for _ in range(repeat):
+            # Identical frames are skipped otherwise
+            tlc.show(force=True)
+        show_us = time.ticks_diff(time.ticks_us(), start) // repeat
+        print(f"{chip_count:3d} chips {len(tlc._buffer):5d} bytes: load_frame {load_us} us, show {show_us} us")
+        tlc.set_all_black()
+        tlc.show()
+        tlc.deinit()
+
+
 
 
 if __name__ == "__main__":
@@ -296,6 +588,7 @@ if __name__ == "__main__":
     
     # Uncomment one of these to test:
     # flash_all(tlc, brightness, flash_time)
+    # tlc.deinit(); benchmark_show()
     cycle_through_leds(tlc, brightness, cycle_time)
     
     print("Switch Off FET")
@@ -0,0 +1,182 @@
+from array import array
+from machine import Timer
+import micropython
+
+from fixedpoint import lerp
+
+
+class TLC59711Fader:
+    """Timer-driven fades between 16-bit PWM values on a TLC59711.
+
+    A machine.Timer fires at a fixed frame rate and schedules one fade step
+    through micropython.schedule, so fades advance independently of how long
+    the rest of the main loop takes. Each step interpolates the active
+    channels with integer math into a preallocated frame and shows it.
+    """
+
+    def __init__(self, tlc, fps=100, timer_id=-1):
+        """Initialize the fader.
+
+        Args:
+            tlc: TLC59711 instance to drive
+            fps: Fade frame rate in Hz
+            timer_id: machine.Timer id (-1 for a virtual timer)
+        """
+        self._tlc = tlc
+        self.fps = fps
+        self._timer = Timer(timer_id)
+        self._running = False
+        self._scheduled = False
+
+        count = tlc.channel_count
+        self._frame = array("H", [0] * count)
+        self._from = array("H", [0] * count)
+        self._to = array("H", [0] * count)
+        self._step = array("H", [0] * count)
+        self._steps = array("H", [0] * count)
+        # Per-channel flag for a fade in progress. A bytearray rather than a
+        # bitmask, which would turn into a heap-allocated int on long chains.
+        self._active = bytearray(count)
+        self._active_count = 0
+
+        # Bound methods allocate; create them once for the timer callback
+        self._tick_ref = self._tick
+        self._advance_ref = self._advance
+
+    @property
+    def busy(self):
+        """True while any channel is fading."""
+        return self._active_count != 0
+
+    def fade_to(self, channel_index, target, duration_ms):
+        """Fade one channel from its current value to a 16-bit target.
+
+        Args:
+            channel_index: Channel to fade
+            target: Raw 16-bit PWM value to end on
+            duration_ms: Fade length; 0 jumps straight to the target
+        """
+        if not 0 <= target <= 65535:
+            raise ValueError(f"target {target} not in range: 0..65535")
+        self._begin(channel_index, target, self._frames(duration_ms))
+        self._start_timer()
+
+    def fade_channels(self, targets, duration_ms, channels=None):
+        """Fade many channels towards raw 16-bit targets.
+
+        Channels already at or fading towards their target are left alone,
+        so this can be called every loop iteration with the desired frame.
+
+        Args:
+            targets: One target per channel, e.g. an array('H')
+            duration_ms: Fade length; 0 jumps straight to the targets
+            channels: Optional sequence of channel numbers to fade, e.g.
+                a tuple or array('H'); all channels if None
+        """
+        count = self._tlc.channel_count
+        if len(targets) < count:
+            raise ValueError(f"expected {count} targets, got {len(targets)}")
+        steps = self._frames(duration_ms)
+        if channels is None:
+            channels = range(count)
+        for channel_index in channels:
+            self._begin(channel_index, targets[channel_index], steps)
+        self._start_timer()
+
+    def fade_group(self, name, target, duration_ms):
+        """Fade every channel of a named TLC59711 group to one 16-bit target.
+
+        Like fade_channels(), channels already heading to the target are
+        left alone.
+        """
+        if not 0 <= target <= 65535:
+            raise ValueError(f"target {target} not in range: 0..65535")
+        steps = self._frames(duration_ms)
+        for channel_index in self._tlc.group(name):
+            self._begin(channel_index, target, steps)
+        self._start_timer()
+
+    def stop(self):
+        """Stop all fades, leaving channels at their current values."""
+        for channel_index in range(len(self._active)):
+            self._active[channel_index] = 0
+        self._active_count = 0
+        self._stop_timer()
+
+    def deinit(self):
+        """Stop fading and release the timer."""
+        self.stop()
+
+    def _frames(self, duration_ms):
+        return min(65535, (duration_ms * self.fps) // 1000)
+
+    def _begin(self, channel_index, target, steps):
+        if self._active[channel_index]:
+            if self._to[channel_index] == target:
+                return
+            current = self._frame[channel_index]
+        else:
+            current = self._tlc.get_channel_raw(channel_index)
+            if current == target:
+                return
+        if steps == 0:
+            if self._active[channel_index]:
+                self._active[channel_index] = 0
+                self._active_count -= 1
+            self._frame[channel_index] = target
+            self._tlc.set_channel_raw(channel_index, target)
+            self._tlc.show()
+            return
+        self._frame[channel_index] = current
+        self._from[channel_index] = current
+        self._to[channel_index] = target
+        self._step[channel_index] = 0
+        self._steps[channel_index] = steps
+        if not self._active[channel_index]:
+            self._active[channel_index] = 1
+            self._active_count += 1
+
+    def _start_timer(self):
+        if self._active_count and not self._running:
+            self._running = True
+            self._timer.init(freq=self.fps, mode=Timer.PERIODIC, callback=self._tick_ref)
+
+    def _stop_timer(self):
+        if self._running:
+            self._timer.deinit()
+            self._running = False
+
+    def _tick(self, timer):
+        # Interrupt context: defer the work, and drop the tick if the last
+        # one has not run yet rather than piling up the schedule queue
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                micropython.schedule(self._advance_ref, 0)
+            except RuntimeError:
+                self._scheduled = False
+
+    def _advance(self, _):
+        self._scheduled = False
+        if not self._active_count:
+            self._stop_timer()
+            return
+        tlc = self._tlc
+        active = self._active
+        frame = self._frame
+        for channel_index in range(len(active)):
+            if not active[channel_index]:
+                continue
+            step = self._step[channel_index] + 1
+            steps = self._steps[channel_index]
+            if step >= steps:
+                frame[channel_index] = self._to[channel_index]
+                active[channel_index] = 0
+                self._active_count -= 1
+            else:
+                self._step[channel_index] = step
+                frame[channel_index] = lerp(self._from[channel_index], self._to[channel_index], step, steps)
+            tlc.set_channel_raw(channel_index, frame[channel_index])
+        tlc.show()
+        if not self._active_count:
+            self._stop_timer()
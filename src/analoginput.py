@@ -21,6 +21,7 @@ class AnalogInput:
         self._seesaw = seesaw
         self._pin = pin
         self._delay = delay
+        self._delay_us = int(delay * 1000000)
 
     def deinit(self):
         pass
@@ -28,7 +29,22 @@ class AnalogInput:
     @property
     def value(self):
         """The current analog value on the pin, as an integer from 0..65535 (inclusive)"""
-        return self._seesaw.analog_read(self._pin, self._delay)
+        return self._seesaw.analog_read_finish(
+            self._seesaw.analog_read_start(self._pin, self._delay_us)
+        )
+
+    def start(self):
+        """Start a conversion and return a handle for `finish`, leaving the
+        bus free while the ADC settles"""
+        return self._seesaw.analog_read_start(self._pin, self._delay_us)
+
+    def ready(self, handle):
+        """Whether `finish` can return without waiting"""
+        return self._seesaw.read_ready(handle)
+
+    def finish(self, handle):
+        """The result of the conversion started by `start`"""
+        return self._seesaw.analog_read_finish(handle)
 
     @property
     def reference_voltage(self):
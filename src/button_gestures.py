@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: MIT
+"""
+`button_gestures`
+====================================================
+
+Click, double click, long press and hold-repeat detection for a Qwiic Button.
+
+The button timestamps every press and click (release) in its own queues, so
+gestures are classified from when things happened on the button rather than
+from when the main loop happened to poll it. `GestureRecognizer.update` only
+drains the queues after the button reports an event; while idle it costs one
+status read, or nothing at all if the button is in event mode. All timings are
+integer milliseconds on the ``time.ticks_ms`` clock.
+"""
+import time
+from array import array
+
+from qwiic_button import ButtonStatus
+from ringbuffer import RingBuffer
+
+SINGLE_CLICK = 1
+"""Released after a short press with no second click following"""
+DOUBLE_CLICK = 2
+"""Second short click started within ``double_ms`` of the first release"""
+LONG_PRESS = 3
+"""Held for ``long_ms``; reported once, while the button is still down"""
+HOLD_REPEAT = 4
+"""Reported every ``repeat_ms`` after `LONG_PRESS` until release"""
+
+# The Qwiic Button queues hold 15 timestamps each
+_QUEUE_DEPTH = 15
+
+
+class GestureRecognizer:
+    """Classify gestures on a `~qwiic_button.QwiicButton` from its timestamp
+    queues
+
+    :param ~qwiic_button.QwiicButton button: The button
+    :param int double_ms: Longest gap between a release and the next press
+        that still makes a double click
+    :param int long_ms: Hold time for a long press
+    :param int repeat_ms: Interval of `HOLD_REPEAT` after a long press, 0 for
+        none
+    :param int size: Number of gestures buffered between `get` calls
+    :param callback: Optional function called from `update` with each gesture"""
+
+    def __init__(self, button, double_ms=300, long_ms=600, repeat_ms=200, size=8, callback=None):
+        self._button = button
+        self.double_ms = double_ms
+        self.long_ms = long_ms
+        self.repeat_ms = repeat_ms
+        self._callback = callback
+        self._gestures = RingBuffer(size, "B")
+
+        self._status = ButtonStatus()
+        # Entry ages and the ticks_ms each one was read at
+        self._pressed = array("I", [0] * _QUEUE_DEPTH)
+        self._pressed_read = array("I", [0] * _QUEUE_DEPTH)
+        self._clicked = array("I", [0] * _QUEUE_DEPTH)
+        self._clicked_read = array("I", [0] * _QUEUE_DEPTH)
+
+        self._down = False
+        self._long_sent = False
+        self._pending_click = False
+        self._press_ms = 0
+        self._release_ms = 0
+        self._next_repeat_ms = 0
+
+        # Start from empty queues so old presses aren't reported
+        self._drain()
+
+    def _drain(self):
+        button = self._button
+        return (button.drain_pressed(self._pressed, 0, self._pressed_read),
+                button.drain_clicked(self._clicked, 0, self._clicked_read))
+
+    def _emit(self, gesture):
+        if self._callback is not None:
+            self._callback(gesture)
+        self._gestures.put(gesture)
+
+    def _event_available(self):
+        button = self._button
+        if button.events_enabled:
+            button.service()
+            available = False
+            while button.get_event(self._status) is not None:
+                available = True
+            return available
+        status = button.read_status(self._status)
+        if status.event_available:
+            button.consume_event(status)
+            return True
+        return False
+
+    def update(self):
+        """Fetch new presses and clicks if the button reported any and
+        classify them. Call this from the main loop. Returns the number of
+        gestures waiting in the buffer."""
+        if self._event_available():
+            presses, clicks = self._drain()
+            # Queue entries are ages in ms, oldest first, each as of its own
+            # read; turn them into times and replay both queues in order
+            p = c = 0
+            while p < presses or c < clicks:
+                press_ms = time.ticks_add(self._pressed_read[p], -self._pressed[p]) if p < presses else 0
+                click_ms = time.ticks_add(self._clicked_read[c], -self._clicked[c]) if c < clicks else 0
+                if c >= clicks or (p < presses and time.ticks_diff(click_ms, press_ms) >= 0):
+                    self._on_press(press_ms)
+                    p += 1
+                else:
+                    self._on_release(click_ms)
+                    c += 1
+        self._check_timers(time.ticks_ms())
+        return len(self._gestures)
+
+    def _on_press(self, now):
+        if self._pending_click and time.ticks_diff(now, self._release_ms) > self.double_ms:
+            self._pending_click = False
+            self._emit(SINGLE_CLICK)
+        self._down = True
+        self._long_sent = False
+        self._press_ms = now
+
+    def _on_release(self, now):
+        if not self._down:
+            # Press was lost with a full queue; count it as a short click
+            self._press_ms = now
+        self._down = False
+        if self._long_sent:
+            return
+        if time.ticks_diff(now, self._press_ms) >= self.long_ms:
+            # Held and released between two updates
+            self._pending_click = False
+            self._emit(LONG_PRESS)
+        elif self._pending_click and time.ticks_diff(self._press_ms, self._release_ms) <= self.double_ms:
+            self._pending_click = False
+            self._emit(DOUBLE_CLICK)
+        else:
+            self._pending_click = True
+            self._release_ms = now
+
+    def _check_timers(self, now):
+        if self._down:
+            if not self._long_sent:
+                if time.ticks_diff(now, self._press_ms) >= self.long_ms:
+                    self._long_sent = True
+                    self._pending_click = False
+                    self._emit(LONG_PRESS)
+                    self._next_repeat_ms = time.ticks_add(self._press_ms, self.long_ms + self.repeat_ms)
+            elif self.repeat_ms:
+                while time.ticks_diff(now, self._next_repeat_ms) >= 0:
+                    self._emit(HOLD_REPEAT)
+                    self._next_repeat_ms = time.ticks_add(self._next_repeat_ms, self.repeat_ms)
+        elif self._pending_click and time.ticks_diff(now, self._release_ms) > self.double_ms:
+            self._pending_click = False
+            self._emit(SINGLE_CLICK)
+
+    def get(self):
+        """Return the oldest recognized gesture, or None"""
+        return self._gestures.get()
+
+    def __len__(self):
+        return len(self._gestures)
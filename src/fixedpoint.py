@@ -0,0 +1,174 @@
+# SPDX-License-Identifier: MIT
+"""
+`fixedpoint` - integer kernels for color and brightness math
+===========================================================
+
+On the RP2040 MicroPython port every float result is a heap allocation and a
+soft-float operation. These helpers replace the float scalings on the
+slider -> pixel -> PWM path with integer multiply, shift and divide, giving
+the same results as the float expressions they replace (see `check`).
+
+Every kernel expects non-negative inputs and keeps intermediates well inside
+MicroPython's small-int range.
+"""
+
+from array import array
+
+CURVE_LINEAR = "linear"
+CURVE_GAMMA22 = "gamma2.2"
+CURVE_CIE1931 = "cie1931"
+
+
+def scale(value, in_max, out_max):
+    """
+    Map ``0..in_max`` onto ``0..out_max``, truncating like
+    ``int(value / in_max * out_max)``.
+
+    :param int value: input value, 0 to in_max
+    :param int in_max: top of the input range
+    :param int out_max: top of the output range
+    :return: scaled integer
+    """
+    return (value * out_max) // in_max
+
+
+def lerp(start, end, step, steps):
+    """
+    Interpolate from ``start`` to ``end``, truncating like
+    ``int(start + (end - start) * (step / steps))``.
+
+    :param int start: value at step 0
+    :param int end: value at ``steps``
+    :param int step: position, 0 to steps
+    :param int steps: number of steps between start and end
+    :return: interpolated integer
+    """
+    return (start * steps + (end - start) * step) // steps
+
+
+def percent_to_u16(percent):
+    """
+    Convert 0-100 percent to a 16-bit PWM value, like ``int(percent * 655.35)``.
+
+    :param int percent: 0 to 100
+    :return: 0 to 65535
+    """
+    return (percent * 65535) // 100
+
+
+def u16_to_percent(value):
+    """
+    Convert a 16-bit PWM value to the nearest percent, like
+    ``round(value / 655.35)``.
+
+    :param int value: 0 to 65535
+    :return: 0 to 100
+    """
+    return (value * 100 + 32767) // 65535
+
+
+def brightness_table(brightness):
+    """
+    Build a 256-entry table of ``int(i * brightness)`` so per-pixel brightness
+    scaling is a lookup. The floats are only used while building the table.
+
+    :param float brightness: 0.0 to 1.0
+    :return: bytearray of 256 scaled values
+    """
+    return bytearray(int(i * brightness) for i in range(256))
+
+
+def dimming_table(curve=CURVE_LINEAR, size=1024):
+    """
+    Build a ``size``-entry table mapping a level (e.g. a raw 10-bit ADC
+    reading) to a 16-bit PWM value along a dimming curve. The floats are only
+    used while building the table.
+
+    :param str curve: `CURVE_LINEAR`, `CURVE_GAMMA22` or `CURVE_CIE1931`
+    :param int size: number of levels
+    :return: array('H') of 16-bit PWM values
+    """
+    if curve == CURVE_LINEAR:
+        shape = lambda x: x
+    elif curve == CURVE_GAMMA22:
+        shape = lambda x: x ** 2.2
+    elif curve == CURVE_CIE1931:
+        # CIE 1931 lightness L* (0-100) to relative luminance
+        def shape(x):
+            lightness = x * 100
+            if lightness <= 8:
+                return lightness / 903.3
+            return ((lightness + 16) / 116) ** 3
+    else:
+        raise ValueError("unknown dimming curve: {}".format(curve))
+    table = array("H", bytes(2 * size))
+    top = size - 1
+    for level in range(size):
+        table[level] = int(shape(level / top) * 65535 + 0.5)
+    return table
+
+
+def check(full=False):
+    """
+    Compare every kernel against the float expression it replaces over its
+    whole input domain. Returns the number of mismatches and prints the first
+    few. The only accepted difference is where the exact result is a whole
+    number and float rounding lands just below it, which the integer kernel
+    gets right.
+
+    :param bool full: sweep every start/end color pair for `lerp` instead of
+        a grid of them. That is 16M cases, so only use it on a host.
+    """
+    failures = 0
+
+    def report(name, args, expected, got):
+        if failures < 10:
+            print("mismatch in {}{}: float {} int {}".format(name, args, expected, got))
+        return 1
+
+    # main.convert_to_255 and NeoSliderController.potentiometer_to_color
+    for out_max in (100, 255):
+        for value in range(1024):
+            expected = int(value / 1023 * out_max)
+            got = scale(value, 1023, out_max)
+            if got != expected:
+                failures += report("scale", (value, 1023, out_max), expected, got)
+
+    # TLC59711.set_channel and __getitem__
+    for percent in range(101):
+        expected = int(percent * 655.35)
+        got = percent_to_u16(percent)
+        if got != expected:
+            failures += report("percent_to_u16", (percent,), expected, got)
+    for value in range(65536):
+        expected = round(value / 655.35)
+        got = u16_to_percent(value)
+        if got != expected:
+            failures += report("u16_to_percent", (value,), expected, got)
+
+    # rainbowio two_color_gradient and both halves of custom_colorwheel
+    colors = range(256) if full else (0, 1, 51, 85, 102, 127, 128, 170, 185, 204, 254, 255)
+    for steps, first, last, shift in ((255, 0, 255, 0), (127, 0, 127, 0), (128, 128, 255, 127)):
+        for start in colors:
+            for end in colors:
+                for color_value in range(first, last + 1):
+                    step = color_value - shift
+                    expected = int(start + (end - start) * (step / float(steps)))
+                    got = lerp(start, end, step, steps)
+                    exact = ((end - start) * step) % steps == 0
+                    if got != expected and not (exact and got == expected + 1):
+                        failures += report("lerp", (start, end, step, steps), expected, got)
+
+    # SeeSaw_NeoPixel brightness scaling
+    for brightness in (0.0, 0.1, 0.25, 0.3, 0.5, 0.7, 0.9, 0.98):
+        table = brightness_table(brightness)
+        for value in range(256):
+            if table[value] != int(value * brightness):
+                failures += report("brightness_table", (brightness, value), int(value * brightness), table[value])
+
+    return failures
+
+
+if __name__ == "__main__":
+    failed = check()
+    print("fixedpoint: {} mismatches".format(failed) if failed else "fixedpoint: all kernels match")
@@ -118,6 +118,71 @@ class I2CDriver(object):
 		pass
 
 
+	#-------------------------------------------------------------------------
+	# write-behind and shadow cache stubs.
+	#
+	# Drivers that do not queue or cache writes can leave these as no-ops.
+
+	def flush(self, address=None):
+		""" 
+			Called to send any queued register writes to the bus.
+
+			:param address: The I2C address to flush, or `None` for every device
+
+			:return: None
+
+		"""
+		return None
+
+	def shadowRegisters(self, address, start, count):
+		""" 
+			Called to declare a range of registers on a device as safe to cache.
+
+			:param address: The I2C address of the device
+			:param start: The first register in the range
+			:param count: The number of registers in the range
+
+			:return: None
+
+		"""
+		return None
+
+	def shadow_registers(self, address, start, count):
+		return self.shadowRegisters(address, start, count)
+
+	def invalidateShadow(self, address=None, register=None, count=1):
+		""" 
+			Called to forget cached register contents, for example after a device reset.
+
+			:param address: The I2C address to invalidate, or `None` for every device
+			:param register: The first register key to forget, or `None` for all of them
+			:param count: The number of registers to forget from `register`
+
+			:return: None
+
+		"""
+		return None
+
+	def invalidate_shadow(self, address=None, register=None, count=1):
+		return self.invalidateShadow(address, register, count)
+
+	def shadowDiff(self, address, register, value):
+		""" 
+			Called to find which bytes of a write the device does not already hold.
+
+			:param address: The I2C address of the device
+			:param register: The register of the first byte in value
+			:param value: The bytes that are about to be written
+
+			:return: None if nothing needs to be sent, otherwise the (start, end) slice of value to send
+			:rtype: tuple
+
+		"""
+		return (0, len(value))
+
+	def shadow_diff(self, address, register, value):
+		return self.shadowDiff(address, register, value)
+
 	#-------------------------------------------------------------------------		
 	# read Data Command
 
@@ -201,6 +266,36 @@ class I2CDriver(object):
 		"""
 		return None
 	
+	def readInto(self, address, commandCode, buf):
+		""" 
+			Called to read bytes from a specific device into a caller-owned buffer,
+			without allocating.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from, or `None` for no command
+			:param buf: A bytearray or memoryview to fill. Its length is the number of bytes read.
+
+			:return: buf
+			:rtype: bytearray
+
+		"""
+		return None
+
+	def read_into(self, address, commandCode, buf):
+		""" 
+			Called to read bytes from a specific device into a caller-owned buffer,
+			without allocating.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from, or `None` for no command
+			:param buf: A bytearray or memoryview to fill. Its length is the number of bytes read.
+
+			:return: buf
+			:rtype: bytearray
+
+		"""
+		return None
+
 	#--------------------------------------------------------------------------	
 	# write Data Commands 
 	#
@@ -313,6 +408,62 @@ class I2CDriver(object):
 		"""
 		return None
 	
+	def writeFrom(self, address, commandCode, buf):
+		""" 
+			Called to write a caller-owned buffer to a device, without allocating.
+
+			:param address: The I2C address of the device to write to
+			:param commandCode: The "command" or register to write to
+			:param buf: A bytes, bytearray or memoryview to write on the I2C bus.
+
+			:return: None
+
+		"""
+		return None
+
+	def write_from(self, address, commandCode, buf):
+		""" 
+			Called to write a caller-owned buffer to a device, without allocating.
+
+			:param address: The I2C address of the device to write to
+			:param commandCode: The "command" or register to write to
+			:param buf: A bytes, bytearray or memoryview to write on the I2C bus.
+
+			:return: None
+
+		"""
+		return None
+
+	def writeReadInto(self, address, writeBuf, readBuf):
+		""" 
+			Called to write a buffer to a device, send no stop bit, and then read into a
+			caller-owned buffer, without allocating.
+
+			:param address: The I2C address of the device to read from
+			:param writeBuf: A bytes, bytearray or memoryview to write on the I2C bus.
+			:param readBuf: A bytearray or memoryview to fill with the reply.
+
+			:return: readBuf
+			:rtype: bytearray
+
+		"""
+		return None
+
+	def write_read_into(self, address, writeBuf, readBuf):
+		""" 
+			Called to write a buffer to a device, send no stop bit, and then read into a
+			caller-owned buffer, without allocating.
+
+			:param address: The I2C address of the device to read from
+			:param writeBuf: A bytes, bytearray or memoryview to write on the I2C bus.
+			:param readBuf: A bytearray or memoryview to fill with the reply.
+
+			:return: readBuf
+			:rtype: bytearray
+
+		"""
+		return None
+
 	def writeReadBlock(self, address, writeBytes, readNBytes):
 		""" 
 			Called to write a block of bytes to a device, send no stop bit, and then read a block of bytes.
@@ -1,17 +1,33 @@
-from qwiic_button import QwiicButton
+from mp_i2c import get_shared_bus
+from qwiic_button import QwiicButton, ButtonStatus
 from neoslider import NeoSliderController as NeoSlider
+from button_gestures import GestureRecognizer, SINGLE_CLICK
 import time
 import sys
 
 from TLC59711_MP import TLC59711
+from TLC59711_fade import TLC59711Fader
+from fixedpoint import scale, CURVE_CIE1931
 
 GREEN_BUTTON = 0x6F
 RED_BUTTON = 0x6F
 NEO_SLIDER_ADDR = 0x30
 
+# Set to a band in ADC counts to only read the slider after it moves; set the
+# INT pin too if the slider's INT line is wired to the Pico
+SLIDER_WATCH_BAND = None
+SLIDER_INT_PIN = None
+# Set to the Pico pin wired to the green button's INT line to only read the
+# button when it reports an event instead of polling it every loop
+BUTTON_INT_PIN = None
+# Step the toggle cycle on single clicks classified from the button's own
+# timestamps, instead of on every event seen when polling
+BUTTON_GESTURES = False
+
 brightness = 255
 standby_brightness = 0
 debounce_time = 5  # in milliseconds
+fade_time = 250  # in milliseconds, external LED transitions
 
 button_state = False  # Initialize button state
 
@@ -26,6 +42,8 @@ button_green.set_debounce_time(debounce_time)
 # button_red.set_debounce_time(debounce_time)
 
 button_green.LED_on(standby_brightness)  # Set initial LED brightness
+if BUTTON_INT_PIN is not None:
+    button_green.enable_events(BUTTON_INT_PIN)
 # button_red.LED_on(standby_brightness)  # Set initial LED brightness
 
 # Initialize counters outside the main loop
@@ -33,10 +51,21 @@ green_count = 0
 red_count = 0
 
 slider = NeoSlider()
+if SLIDER_WATCH_BAND is not None:
+    slider.watch(band=SLIDER_WATCH_BAND, int_pin=SLIDER_INT_PIN)
+
+# Buttons and slider share one bus; queue register writes and send them as
+# merged bursts once per loop iteration
+i2c_bus = get_shared_bus(sda=12, scl=13, freq=100000)
+i2c_bus.set_write_behind(True)
 
-# Track previous states to detect changes
-prev_state = False
-prev_brightness = -1  # Initialize to -1 to ensure first update
+# Reused for every event taken off a button's queue
+button_event = ButtonStatus()
+
+# Gesture recognizers by button, see BUTTON_GESTURES
+gestures = {}
+if BUTTON_GESTURES:
+    gestures[button_green] = GestureRecognizer(button_green)
 
 def check_button_status(button):
     """
@@ -45,22 +74,37 @@ def check_button_status(button):
     :param button: QwiicButton instance
     :return: True if button is pressed, False otherwise
     """
-    if button.available():
+    recognizer = gestures.get(button)
+    if recognizer is not None:
+        recognizer.update()
+        pressed = False
+        while len(recognizer):
+            if recognizer.get() == SINGLE_CLICK:
+                pressed = True
+        return pressed
+    if button.events_enabled:
+        button.service()
+        return button.get_event(button_event) is not None
+    status = button.read_status()
+    if status.event_available:
         # print(f"{button.address} Button Pressed")
-        button.clear_event_bits()
+        button.consume_event(status)
         return True
     return False
 
-def button_toggle(button, count, brightness, standby_brightness, state, edge="rise"):
+def button_toggle(button, count, brightness, standby_brightness, state, edge="rise", pressed=None):
     """
     Toggle button LED based on press count and edge type.
     
     :param button: QwiicButton instance
     :param count: Current press count
     :param edge: "rise" or "fall" - determines when LED turns on/off
+    :param pressed: Result of check_button_status() if already polled
     :return: Updated count value
     """
-    if check_button_status(button):
+    if pressed is None:
+        pressed = check_button_status(button)
+    if pressed:
         count += 1
         count = count % 4
         # print(f"Button {button.address} count: {count}, edge: {edge}")
@@ -89,72 +133,63 @@ def convert_to_255(value):
     """
     convert slider 0- 1023 value to 0-255 for led brightness
     """
-    return max(0,int(value / 1023 * 100))
+    return max(0, scale(value, 1023, 100))
+
+# TLC59711 channels in use, by fixture. Can also be a path to a JSON file
+# holding the same mapping.
+LED_GROUPS = {
+    "green_button": [0, 1, 2],
+    "red_button": [3, 4],
+    "slider": [6, 7, 9, 10],
+}
 
-def update_leds(tlc, brightness, state):
+def update_leds(tlc, fader, level, state):
     """
-    Update all LED channels with the given brightness.
+    Fade all LED groups towards a raw 0-1023 slider level.
     """
-    if state:
-        # Set all channels to the specified brightness
-        tlc[0] = int(brightness)  # Set brightness for green button
-        tlc[1] = int(brightness)  # Set brightness for green button
-        tlc[2] = int(brightness)  # Set brightness for green button
-        tlc[3] = int(brightness)  # Set brightness for red button
-        tlc[4] = int(brightness)  # Set brightness for red button
-        tlc[6] = int(brightness)  # Set brightness for slider
-        tlc[7] = int(brightness)  # Set brightness for slider
-        tlc[9] = int(brightness)  # Set brightness for slider
-        tlc[10] = int(brightness) # Set brightness for slider
-    else:
-        # Turn off all channels
-        tlc[0] = 0
-        tlc[1] = 0
-        tlc[2] = 0
-        tlc[3] = 0
-        tlc[4] = 0
-        tlc[6] = 0
-        tlc[7] = 0
-        tlc[9] = 0
-        tlc[10] = 0
-    
-    tlc.show()
+    value = tlc.dim(level) if state else 0
+    for name in tlc.groups():
+        fader.fade_group(name, value, fade_time)
 
 if __name__ == '__main__':
     tlc = TLC59711(pixel_count=4, spi_id=0, sck_pin=2, mosi_pin=3)
     tlc.set_brightness(100, 100, 127)
+    # Slider readings index the 16-bit dimming curve directly
+    tlc.set_dimming_curve(CURVE_CIE1931)
+    tlc.load_groups(LED_GROUPS)
+    fader = TLC59711Fader(tlc)
     
     # Initialize LEDs to off state
-    update_leds(tlc, 0, False)
+    tlc.show(force=True)
     
     try:
         while True:
-            slider.update_pixels()
-            current_slider_value = slider.get_value()
+            # Poll the button while the slider's ADC conversion is running,
+            # then read the slider once and use that value for everything
+            if slider.changed():
+                slider_read = slider.start_read()
+                green_pressed = check_button_status(button_green)
+                current_slider_value = slider.finish_read(slider_read)
+                slider.update_pixels(current_slider_value)
+            else:
+                green_pressed = check_button_status(button_green)
+                current_slider_value = slider.last_value
+
             on_brightness = convert_to_255(current_slider_value)
 
             # print(f"Slider Value: {current_slider_value}, Brightness: {on_brightness}")
 
-            green_count, state = button_toggle(button_green, green_count, on_brightness, standby_brightness, button_state)
-            
-            # Check if state changed or brightness changed (when state is on)
-            state_changed = (state != prev_state)
-            brightness_changed = (state and on_brightness != prev_brightness)
+            green_count, state = button_toggle(button_green, green_count, on_brightness, standby_brightness, button_state, pressed=green_pressed)
             
-            if state_changed or brightness_changed:
-                # Only update LEDs when there's a change
-                update_leds(tlc, on_brightness, state)
-                
-                # Update previous values
-                prev_state = state
-                prev_brightness = on_brightness
-                
-                # Debug output
-                # print(f"Update sent - State: {state}, Brightness: {on_brightness}")
+            # Fades step on a timer; the driver only transmits frames that
+            # differ from the last one
+            update_leds(tlc, fader, current_slider_value, state)
 
+            i2c_bus.flush()
             time.sleep(0.01)  # Polling interval
             
     except (KeyboardInterrupt, SystemExit) as exErr:
+        fader.deinit()
         tlc.set_all_black()
         tlc.show()
         tlc.deinit()
@@ -75,11 +75,24 @@ def _connectToI2CBus(sda=None, scl=None, freq=100000, *args, **argk):
 def _connect_to_i2c_bus(*args, **argk):
 	return _connectToI2CBus(*args, **argk)
 
+# used internally in this file to work out which peripheral a set of pins maps to,
+# mirroring the pin rules in _connectToI2CBus
+def _busId(sda=None, scl=None):
+	if sys.platform == 'rp2':
+		if scl is not None:
+			return (scl // 2) % 2
+		return 0
+	elif 'xbee' in sys.platform:
+		return 1
+	return 0
+
 class qwiic_i2c(I2CDriver):
 
 	# Constructor
 	name = _PLATFORM_NAME
 	_i2cbus = None
+	_busKey = None
+	_refCount = 0
 
 	def __init__(self, sda=None, scl=None, freq=100000, *args, **argk):
 		I2CDriver.__init__(self) # init super
@@ -90,6 +103,19 @@ class qwiic_i2c(I2CDriver):
 
 		self._i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=self._freq)
 
+		# scratch buffers for the single byte and word helpers
+		self._buf1 = bytearray(1)
+		self._buf2 = bytearray(2)
+
+		# write-behind state - see setWriteBehind()
+		self._writeBehind = False
+		self._pending = {}
+
+		# shadow cache state - see shadowRegisters()
+		self._shadow = {}
+		self._shadowRanges = {}
+		self.suppressedWrites = 0
+
 	@classmethod
 	def isPlatform(cls):
 		try:
@@ -127,65 +153,301 @@ class qwiic_i2c(I2CDriver):
 		if(name != 'i2cbus'):
 			super(I2CDriver, self).__setattr__(name, value)
 
+	# write-behind -----------------------------------------------------------
+	#
+	# When enabled, register writes are not sent immediately. They are queued per
+	# device address, one byte per register, so a later write to the same
+	# register replaces the earlier value. flush() then sends each run of
+	# adjacent registers as a single writeto_mem burst.
+	#
+	# Any read, command or raw transfer to a device flushes that device first,
+	# so reads always observe the queued writes.
+
+	def setWriteBehind(self, enabled):
+		"""
+			Enable or disable write-behind mode. Disabling it flushes any queued writes.
+
+			:param enabled: True to queue register writes until flush()
+
+			:return: None
+
+		"""
+		if not enabled:
+			self.flush()
+		self._writeBehind = enabled
+
+	def set_write_behind(self, enabled):
+		return self.setWriteBehind(enabled)
+
+	def flush(self, address=None):
+		"""
+			Send queued register writes to the bus.
+
+			:param address: The I2C address to flush, or `None` for every device
+
+			:return: None
+
+		"""
+		if not self._pending:
+			return
+		if address is None:
+			for devAddress in list(self._pending):
+				self._flushDevice(devAddress)
+		else:
+			self._flushDevice(address)
+
+	def _queueWrite(self, address, commandCode, value):
+		pending = self._pending.get(address)
+		if pending is None:
+			pending = {}
+			self._pending[address] = pending
+		for i in range(len(value)):
+			pending[commandCode + i] = value[i]
+
+	def _flushDevice(self, address):
+		pending = self._pending.pop(address, None)
+		if not pending:
+			return
+		registers = sorted(pending)
+		start = registers[0]
+		run = bytearray()
+		for register in registers:
+			if register != start + len(run):
+				self._writeMem(address, start, run)
+				start = register
+				run = bytearray()
+			run.append(pending[register])
+		self._writeMem(address, start, run)
+
+	def _writeMem(self, address, commandCode, value):
+		if address not in self._shadowRanges:
+			self._i2cbus.writeto_mem(address, commandCode, value)
+			return
+
+		span = self.shadowDiff(address, commandCode, value)
+		if span is None:
+			self.suppressedWrites += 1
+			return
+		lo, hi = span
+		if lo != 0 or hi != len(value):
+			value = memoryview(value)[lo:hi]
+			commandCode += lo
+		try:
+			self._i2cbus.writeto_mem(address, commandCode, value)
+		except OSError:
+			# shadowDiff already recorded these bytes; the device may not have them
+			self.invalidateShadow(address, commandCode, len(value))
+			raise
+
+	def _write(self, address, commandCode, value):
+		if self._writeBehind:
+			self._queueWrite(address, commandCode, value)
+		else:
+			self._writeMem(address, commandCode, value)
+
+	# shadow cache -----------------------------------------------------------
+	#
+	# Write-through copy of the last bytes written to each (address, register).
+	# Only registers a driver has declared with shadowRegisters() are cached:
+	# status and command registers that the device changes by itself must
+	# always reach the bus. A write whose bytes all match the cache is dropped,
+	# and a partial match is trimmed to the span that actually changed.
+	#
+	# Registers are plain integer keys, one per byte: the register number for
+	# 8-bit devices, or any key layout a driver with a wider register map
+	# chooses.
+
+	def shadowRegisters(self, address, start, count):
+		"""
+			Declare a range of registers on a device as safe to cache.
+
+			:param address: The I2C address of the device
+			:param start: The first register key in the range
+			:param count: The number of registers in the range
+
+			:return: None
+
+		"""
+		ranges = self._shadowRanges.get(address)
+		if ranges is None:
+			ranges = []
+			self._shadowRanges[address] = ranges
+			self._shadow[address] = {}
+		ranges.append((start, start + count))
+
+	def shadow_registers(self, address, start, count):
+		return self.shadowRegisters(address, start, count)
+
+	def invalidateShadow(self, address=None, register=None, count=1):
+		"""
+			Forget the cached register contents, for example after a device reset,
+			so the next write to each register goes to the bus.
+
+			:param address: The I2C address to invalidate, or `None` for every device
+			:param register: The first register key to forget, or `None` for all of them
+			:param count: The number of registers to forget from `register`
+
+			:return: None
+
+		"""
+		if address is None:
+			for shadow in self._shadow.values():
+				shadow.clear()
+		elif address in self._shadow:
+			shadow = self._shadow[address]
+			if register is None:
+				shadow.clear()
+			else:
+				for key in range(register, register + count):
+					shadow.pop(key, None)
+
+	def invalidate_shadow(self, address=None, register=None, count=1):
+		return self.invalidateShadow(address, register, count)
+
+	def shadowDiff(self, address, register, value):
+		"""
+			Compare bytes about to be written against the shadow cache and record
+			them as the new cached contents.
+
+			:param address: The I2C address of the device
+			:param register: The register key of the first byte in `value`
+			:param value: The bytes that are about to be written
+
+			:return: None if the device already holds every byte, otherwise the
+				(start, end) slice of `value` that must be sent
+			:rtype: tuple
+
+		"""
+		nBytes = len(value)
+		ranges = self._shadowRanges.get(address)
+		if ranges is None:
+			return (0, nBytes)
+
+		shadow = self._shadow[address]
+		lo = nBytes
+		hi = 0
+		for i in range(nBytes):
+			key = register + i
+			cacheable = False
+			for start, end in ranges:
+				if start <= key < end:
+					cacheable = True
+					break
+			if cacheable:
+				if shadow.get(key) == value[i]:
+					continue
+				shadow[key] = value[i]
+			if i < lo:
+				lo = i
+			hi = i + 1
+
+		if hi == 0:
+			return None
+		return (lo, hi)
+
+	def shadow_diff(self, address, register, value):
+		return self.shadowDiff(address, register, value)
+
 	# read commands ----------------------------------------------------------
-	def readWord(self, address, commandCode):
+	#
+	# readInto() and writeReadInto() fill caller-owned buffers and allocate
+	# nothing. The classic methods below are thin wrappers; readWord() and
+	# readByte() use scratch buffers owned by the driver so they don't allocate
+	# either.
+
+	def readInto(self, address, commandCode, buf):
+		if self._pending:
+			self._flushDevice(address)
+
 		if (commandCode == None):
-			buffer = self._i2cbus.readfrom(address, 2)
+			self._i2cbus.readfrom_into(address, buf)
 		else:
-			buffer = self._i2cbus.readfrom_mem(address, commandCode, 2)
+			self._i2cbus.readfrom_mem_into(address, commandCode, buf)
 
+		return buf
+
+	def read_into(self, address, commandCode, buf):
+		return self.readInto(address, commandCode, buf)
+
+	def readWord(self, address, commandCode):
+		buffer = self.readInto(address, commandCode, self._buf2)
 		return (buffer[1] << 8 ) | buffer[0]
 
 	def read_word(self, address, commandCode):
 		return self.readWord(address, commandCode)
 
 	def readByte(self, address, commandCode = None):
-		if (commandCode == None):
-			return self._i2cbus.readfrom(address, 1)[0]
-
-		return self._i2cbus.readfrom_mem(address, commandCode, 1)[0]
+		return self.readInto(address, commandCode, self._buf1)[0]
 
 	def read_byte(self, address, commandCode = None):
 		return self.readByte(address, commandCode)
 
 	def readBlock(self, address, commandCode, nBytes):
-		if (commandCode == None):
-			return self._i2cbus.readfrom(address, nBytes)
-
-		return self._i2cbus.readfrom_mem(address, commandCode, nBytes)
+		return self.readInto(address, commandCode, bytearray(nBytes))
 
 	def read_block(self, address, commandCode, nBytes):
 		return self.readBlock(address, commandCode, nBytes)
 
 	# write commands----------------------------------------------------------
+	#
+	# writeFrom() sends a caller-owned buffer as-is. The buffer may be reused as
+	# soon as the call returns: write-behind copies the bytes into its queue.
+
+	def writeFrom(self, address, commandCode, buf):
+		self._write(address, commandCode, buf)
+
+	def write_from(self, address, commandCode, buf):
+		return self.writeFrom(address, commandCode, buf)
+
 	def writeCommand(self, address, commandCode):
-		self._i2cbus.writeto(address, commandCode.to_bytes(1, 'little'))
+		if self._pending:
+			self._flushDevice(address)
+
+		self._buf1[0] = commandCode
+		self._i2cbus.writeto(address, self._buf1)
 
 	def write_command(self, address, commandCode):
 		return self.writeCommand(address, commandCode)
 
 	def writeWord(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, value.to_bytes(2, 'little'))
+		self._buf2[0] = value & 0xFF
+		self._buf2[1] = value >> 8
+		self._write(address, commandCode, self._buf2)
 
 	def write_word(self, address, commandCode, value):
 		return self.writeWord(address, commandCode, value)
 
 	def writeByte(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, value.to_bytes(1, 'little'))
+		self._buf1[0] = value
+		self._write(address, commandCode, self._buf1)
 
 	def write_byte(self, address, commandCode, value):
 		return self.writeByte(address, commandCode, value)
 
 	def writeBlock(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, bytes(value))
+		if not isinstance(value, (bytes, bytearray, memoryview)):
+			value = bytes(value)
+		self._write(address, commandCode, value)
 
 	def write_block(self, address, commandCode, value):
 		return self.writeBlock(address, commandCode, value)
 
-	def writeReadBlock(self, address, writeBytes, readNBytes):
+	def writeReadInto(self, address, writeBuf, readBuf):
+		if self._pending:
+			self._flushDevice(address)
+
 		# micropython I2C doesn't have a corresponding "i2c_rdwr" function like smbus2, so we will make our own by passing stop=False to not send stop bits between repeated transfers
-		self._i2cbus.writeto(address, bytes(writeBytes), False)
-		return self._i2cbus.readfrom(address, readNBytes)
+		self._i2cbus.writeto(address, writeBuf, False)
+		self._i2cbus.readfrom_into(address, readBuf)
+		return readBuf
+
+	def write_read_into(self, address, writeBuf, readBuf):
+		return self.writeReadInto(address, writeBuf, readBuf)
+
+	def writeReadBlock(self, address, writeBytes, readNBytes):
+		if not isinstance(writeBytes, (bytes, bytearray, memoryview)):
+			writeBytes = bytes(writeBytes)
+		return self.writeReadInto(address, writeBytes, bytearray(readNBytes))
 	
 	def write_read_block(self, address, writeBytes, readNBytes):
 		return self.writeReadBlock(address, writeBytes, readNBytes)
@@ -214,6 +476,70 @@ class qwiic_i2c(I2CDriver):
 		return self._i2cbus.scan()
 	
 
+#-----------------------------------------------------------------------------
+# Shared bus registry
+#
+# Every device driver used to construct its own qwiic_i2c object, re-running
+# _connectToI2CBus and holding a separate machine.I2C per device even when they
+# all hang off the same Qwiic chain. The registry below hands out one driver per
+# physical bus, keyed by (bus id, sda, scl, freq), and counts how many devices
+# are using it.
+#
+_busRegistry = {}
+
+def getSharedBus(sda=None, scl=None, freq=100000):
+	"""
+		Returns the shared qwiic_i2c driver for the given pins and frequency,
+		creating it on first use.
+
+		:param sda: SDA pin number, or `None` for the platform default
+		:param scl: SCL pin number, or `None` for the platform default
+		:param freq: bus frequency in Hz
+
+		:return: The shared I2C driver, or None if the bus could not be opened
+		:rtype: qwiic_i2c
+
+	"""
+	key = (_busId(sda, scl), sda, scl, freq)
+	driver = _busRegistry.get(key)
+	if driver is None:
+		driver = qwiic_i2c(sda=sda, scl=scl, freq=freq)
+		if driver.i2cbus is None:
+			return None
+		driver._busKey = key
+		driver._refCount = 0
+		_busRegistry[key] = driver
+
+	driver._refCount += 1
+	return driver
+
+def get_shared_bus(*args, **argk):
+	return getSharedBus(*args, **argk)
+
+def releaseSharedBus(driver):
+	"""
+		Drops one reference to a driver returned by getSharedBus(). The bus is
+		removed from the registry once the last device releases it.
+
+		:param driver: The driver returned by getSharedBus()
+
+		:return: The number of references still held
+		:rtype: int
+
+	"""
+	key = driver._busKey
+	if _busRegistry.get(key) is not driver:
+		return 0
+
+	driver._refCount -= 1
+	if driver._refCount <= 0:
+		del _busRegistry[key]
+		return 0
+	return driver._refCount
+
+def release_shared_bus(driver):
+	return releaseSharedBus(driver)
+
 if __name__ == "__main__":
     # Test the MicroPythonI2C class
     i2c = qwiic_i2c(sda=12, scl=13, freq=100000)
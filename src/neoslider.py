@@ -3,10 +3,10 @@
 """
 NeoSlider NeoPixel Rainbow Demo - Class Implementation
 """
-from mp_i2c import qwiic_i2c
-from rainbowio import custom_colorwheel, two_color_gradient
+from rainbowio import Gradient, render_gradient, render_level
 from seesaw import Seesaw
 from analoginput import AnalogInput
+from fixedpoint import scale
 import seesaw_neopixel
 import time
 
@@ -16,7 +16,12 @@ class NeoSliderController:
     A class to control NeoSlider potentiometer and NeoPixel colors.
     """
     
-    def __init__(self, addr=0x30, potentiometer_pin=18, neopixel_pin=14, num_pixels=4, color1=(0, 0, 185), color2=(255, 255, 255)):
+    # Pixel styles for update_pixels()
+    STYLE_SOLID = "solid"  # every pixel shows the color for the slider position
+    STYLE_SPREAD = "spread"  # the gradient spans the strip, shifted by the slider
+    STYLE_LEVEL = "level"  # pixels light up to the slider position like a meter
+    
+    def __init__(self, addr=0x30, potentiometer_pin=18, neopixel_pin=14, num_pixels=4, color1=(0, 0, 185), color2=(255, 255, 255), i2c_driver=None):
         """
         Initialize the NeoSlider controller.
         
@@ -25,9 +30,10 @@ class NeoSliderController:
             potentiometer_pin: Pin number for potentiometer (default: 18)
             neopixel_pin: Pin number for NeoPixels (default: 14)
             num_pixels: Number of NeoPixels (default: 4)
+            i2c_driver: Existing I2C driver (default: the shared Qwiic bus)
         """
         # NeoSlider Setup
-        self.neoslider = Seesaw(addr=addr)
+        self.neoslider = Seesaw(addr=addr, i2c_driver=i2c_driver)
         self.potentiometer = AnalogInput(self.neoslider, potentiometer_pin)
         self.pixels = seesaw_neopixel.SeeSaw_NeoPixel(
             self.neoslider, neopixel_pin, num_pixels, 
@@ -39,10 +45,21 @@ class NeoSliderController:
         self.color2 = color2
         self.color3 = None  # Optional third color for three-color gradients
         self.gradient_type = "two_color"
+        self.gradient = Gradient(color1, color2)
+        self.style = self.STYLE_SOLID
+        self._frame = bytearray(num_pixels * self.pixels.bpp)
+        
+        # Change notification state, see watch()
+        self.last_value = None
+        self._band = None
+        self._int_pin = None
+        self._refresh_ms = 0
+        self._last_read_ms = 0
+        self._changed = True
     
     def potentiometer_to_color(self, value):
         """Scale the potentiometer values (0-1023) to the colorwheel values (0-255)."""
-        return value / 1023 * 255
+        return scale(value, 1023, 255)
     
     def set_colors(self, color1, color2=None, color3=None, gradient_type="two_color"):
         """
@@ -58,6 +75,10 @@ class NeoSliderController:
         self.color2 = color2
         self.color3 = color3
         self.gradient_type = gradient_type
+        if gradient_type == "three_color" and color3 is not None:
+            self.gradient.set_colors(color1, color2, color3)
+        else:
+            self.gradient.set_colors(color1, color2)
     
     def get_potentiometer_value(self):
         """Get the raw potentiometer value (0-1023)."""
@@ -72,22 +93,95 @@ class NeoSliderController:
         """
         return self.potentiometer.value
     
-    def get_color_output(self):
+    def watch(self, band=8, int_pin=None, refresh_ms=1000):
         """
-        Get the current color output based on potentiometer position.
+        Only report the slider as changed once it leaves a window of +/- band
+        around the last value read, using the seesaw ADC window comparator.
+        
+        Args:
+            band: Half-width of the window in raw ADC counts (default: 8)
+            int_pin: Host pin wired to the seesaw INT line, or None to poll
+                the window flag instead (default: None)
+            refresh_ms: Report a change at least this often, in case a
+                notification is missed or the firmware lacks window
+                support; 0 disables it (default: 1000)
+        """
+        self._band = band
+        self._refresh_ms = refresh_ms
+        self._changed = True
+        if int_pin is not None:
+            from machine import Pin
+            self._int_pin = Pin(int_pin, Pin.IN, Pin.PULL_UP)
+            self._int_pin.irq(handler=self._on_interrupt, trigger=Pin.IRQ_FALLING)
+            self.neoslider.enable_analog_interrupt()
+            # INT only falls again once the latched flag has been read
+            self.neoslider.get_analog_window_flag()
+    
+    def _on_interrupt(self, pin):
+        self._changed = True
+    
+    def changed(self):
+        """
+        Check whether the slider needs to be read. Always True unless watch()
+        has been called.
         
         Returns:
-            tuple: (color_int, raw_potentiometer_value)
+            bool: True if the slider may have moved since the last read
         """
-        pot_value = self.potentiometer.value
-        scaled_value = self.potentiometer_to_color(pot_value)
+        if self._band is None or self._changed:
+            return True
+        if self._refresh_ms and time.ticks_diff(time.ticks_ms(), self._last_read_ms) >= self._refresh_ms:
+            return True
+        if self._int_pin is None:
+            return self.neoslider.get_analog_window_flag()
+        return False
+    
+    def _rearm(self, value):
+        self.last_value = value
+        if self._band is None:
+            return
+        self._changed = False
+        self._last_read_ms = time.ticks_ms()
+        self.neoslider.set_analog_window(
+            max(0, value - self._band), min(1023, value + self._band)
+        )
+        # Reading the status clears a flag latched against the old window,
+        # which releases INT so the next crossing gives a new falling edge
+        self.neoslider.get_analog_window_flag()
+    
+    def start_read(self):
+        """
+        Start a potentiometer read without waiting for the ADC conversion.
         
-        if self.gradient_type == "three_color" and self.color3 is not None:
-            color_output = custom_colorwheel(scaled_value, self.color1, self.color2, self.color3)
-        else:
-            color_output = two_color_gradient(scaled_value, self.color1, self.color2)
+        Returns:
+            Handle to pass to finish_read()
+        """
+        return self.potentiometer.start()
+    
+    def finish_read(self, handle):
+        """
+        Collect a potentiometer read started with start_read().
+        
+        Returns:
+            int: Raw potentiometer value (0-1023)
+        """
+        value = self.potentiometer.finish(handle)
+        self._rearm(value)
+        return value
+    
+    def get_color_output(self, pot_value=None):
+        """
+        Get the current color output based on potentiometer position.
+        
+        Args:
+            pot_value: Potentiometer value to use (default: read it now)
         
-        color_int = color_output[0]  # Extract the integer color value
+        Returns:
+            tuple: (color_int, raw_potentiometer_value)
+        """
+        if pot_value is None:
+            pot_value = self.potentiometer.value
+        color_int = self.gradient[self.potentiometer_to_color(pot_value)]
         return color_int, pot_value
     
     def set_pixel_color(self, pixel_index, color):
@@ -103,10 +197,30 @@ class NeoSliderController:
         else:
             raise IndexError("Pixel index out of range.")
     
-    def update_pixels(self):
-        """Update the NeoPixels with the current color based on potentiometer position."""
-        color_int, _ = self.get_color_output()
-        self.pixels.fill(color_int)
+    def update_pixels(self, pot_value=None):
+        """
+        Update the NeoPixels with the current color based on potentiometer position.
+        
+        Args:
+            pot_value: Potentiometer value to use (default: read it now)
+        """
+        if pot_value is None:
+            pot_value = self.potentiometer.value
+        if self.style == self.STYLE_SOLID:
+            color_int, _ = self.get_color_output(pot_value)
+            self.pixels.fill(color_int)
+            return
+        
+        scaled_value = self.potentiometer_to_color(pot_value)
+        if self.style == self.STYLE_LEVEL:
+            render_level(self._frame, self.gradient, len(self.pixels), scaled_value,
+                         self.pixels.pixel_order, self.pixels.bpp, self.pixels.brightness_scale)
+        else:
+            render_gradient(self._frame, self.gradient, len(self.pixels), scaled_value,
+                            self.pixels.pixel_order, self.pixels.bpp, self.pixels.brightness_scale)
+        self.pixels.load(self._frame)
+        if not self.pixels.auto_write:
+            self.pixels.show()
 
     
     def get_current_state(self):
@@ -49,7 +49,8 @@ New to qwiic? Take a look at the entire [SparkFun Qwiic Ecosystem](https://www.s
 """
 #-----------------------------------------------------------------------------------
 
-from mp_i2c import qwiic_i2c
+from mp_i2c import get_shared_bus, release_shared_bus
+from ringbuffer import RingBuffer
 import sys
 import time
 
@@ -69,6 +70,31 @@ _FULL_ADDRESS_LIST.remove(_QWIIC_BUTTON_DEFAULT_ADDRESS >> 1)   # Remove default
 _AVAILABLE_I2C_ADDRESS = [_QWIIC_BUTTON_DEFAULT_ADDRESS]    # Initialize with default address
 _AVAILABLE_I2C_ADDRESS.extend(_FULL_ADDRESS_LIST) # Add full range of I2C addresses
 
+class ButtonStatus(object):
+    """!
+    Decoded snapshot of the BUTTON_STATUS register, filled in place by
+    QwiicButton.read_status() so polling does not allocate.
+    """
+    def __init__(self):
+        self.raw = 0
+        self.event_available = False
+        self.has_been_clicked = False
+        self.is_pressed = False
+
+    def decode(self, raw):
+        """!
+        Decode a BUTTON_STATUS value into the flag attributes
+
+        @param raw: BUTTON_STATUS register value
+
+        @return **ButtonStatus** this object
+        """
+        self.raw = raw
+        self.event_available = bool(raw & 0x01)
+        self.has_been_clicked = bool(raw & 0x02)
+        self.is_pressed = bool(raw & 0x04)
+        return self
+
 # Define the class that encapsulates the device being created. All information associated 
 # with this device is encapsulated by this class. The device class should be the only value
 # exported from this module.
@@ -139,15 +165,58 @@ class QwiicButton(object):
         else:
             self.address = self.available_addresses[0]
 
-        # Load the I2C driver if one isn't provided
+        # Use the shared bus driver if one isn't provided
+        self._owns_bus = i2c_driver == None
         if i2c_driver == None:
-            self._i2c = qwiic_i2c(sda=12, scl=13, freq=100000)
+            self._i2c = get_shared_bus(sda=12, scl=13, freq=100000)
             if self._i2c == None:
                 print("Unable to load I2C driver for this platform.")
                 return
         else: 
             self._i2c = i2c_driver
 
+        self._status = ButtonStatus()
+        # Queue status, front and back timestamps, read in one go by _drain()
+        self._queue_buf = bytearray(9)
+        self._shadow_config_registers()
+
+        # LED effect currently programmed, see LED_effect(), and the one to
+        # go back to after LED_ack()
+        self._led_effect = None
+        self._led_restore = None
+        self._led_acking = False
+        self._led_revert_ms = 0
+
+        # Event mode state, see enable_events()
+        self._events = None
+        self._int_pin = None
+        self._pending = False
+
+    # -----------------------------------------------
+    # _shadow_config_registers()
+    #
+    # The debounce time and LED registers only change when we write them, so
+    # the bus driver may skip writes that would not change their contents.
+    # BUTTON_STATUS and the queue status registers are updated by the button
+    # itself and are never cached.
+    def _shadow_config_registers(self):
+        self._i2c.shadow_registers(self.address, self.BUTTON_DEBOUNCE_TIME, 2)
+        self._i2c.shadow_registers(self.address, self.LED_BRIGHTNESS, 6)
+
+    # -----------------------------------------------
+    # deinit()
+    #
+    # Gives back the shared bus reference taken by the constructor.
+    def deinit(self):
+        """!
+        Release the shared I2C bus
+
+        @return **Void** Nothing
+        """
+        if self._owns_bus and self._i2c is not None:
+            release_shared_bus(self._i2c)
+        self._i2c = None
+
     # -----------------------------------------------
     # is_connected()
     #
@@ -214,8 +283,13 @@ class QwiicButton(object):
         
         # Write new address to the I2C address register of the Qwiic Button
         self._i2c.writeByte(self.address, self.I2C_ADDRESS, new_address)
+        # Send it now: with write-behind it would stay queued under the old
+        # address while we start talking to the new one
+        self._i2c.flush(self.address)
 
         self.address = new_address
+        self._shadow_config_registers()
+        self._led_effect = None
     
     # ---------------------------------------------------
     # get_I2C_address()
@@ -426,6 +500,155 @@ class QwiicButton(object):
         # Write to BUTTON_STATUS register
         self._i2c.writeByte(self.address, self.BUTTON_STATUS, button_status)
         
+    # -------------------------------------------------------
+    # read_status(status)
+    #
+    # Reads BUTTON_STATUS once and decodes every flag, so a poll
+    # costs one transaction instead of one per flag.
+    def read_status(self, status=None):
+        """!
+        Read the BUTTON_STATUS register once and decode all of its flags
+
+        @param status: ButtonStatus to fill in. If not provided, the
+                button's own status object is reused.
+
+        @return **ButtonStatus** the filled in status
+        """
+        if status is None:
+            status = self._status
+        status.decode(self._i2c.readByte(self.address, self.BUTTON_STATUS))
+        self.event_available = int(status.event_available)
+        self.has_been_clicked = int(status.has_been_clicked)
+        self.is_pressed = int(status.is_pressed)
+        return status
+
+    # -------------------------------------------------------
+    # consume_event(status)
+    #
+    # Clears the event bits based on a status read with read_status(),
+    # without reading BUTTON_STATUS again.
+    def consume_event(self, status=None):
+        """!
+        Clear the is_pressed, has_been_clicked, and event_available
+            bits of the BUTTON_STATUS register from an already read status
+
+        @param status: ButtonStatus from read_status(). If not provided,
+                the button's own status object is used.
+
+        @return **Void** Nothing
+        """
+        if status is None:
+            status = self._status
+        self._i2c.writeByte(self.address, self.BUTTON_STATUS, status.raw & ~(0x7))
+        status.decode(status.raw & ~(0x7))
+
+    # -------------------------------------------------------
+    # enable_events(int_pin, pressed, clicked, size)
+    #
+    # Configures the button interrupt and binds its INT line to a pin
+    # IRQ. BUTTON_STATUS is then only read after the line fires, and
+    # each event is queued for get_event().
+    def enable_events(self, int_pin, pressed=True, clicked=True, size=8):
+        """!
+        Switch the button to interrupt driven event mode
+
+        @param int_pin: host pin number wired to the button's INT line
+        @param pressed: interrupt when the button is pressed
+        @param clicked: interrupt when the button is clicked
+        @param size: number of events buffered between get_event() calls
+
+        @return **Void** Nothing
+        """
+        from machine import Pin
+
+        self.pressed_enable = 1 if pressed else 0
+        self.clicked_enable = 1 if clicked else 0
+        self._i2c.writeByte(self.address, self.INTERRUPT_CONFIG,
+                            (self.pressed_enable << 1) | self.clicked_enable)
+        self._events = RingBuffer(size, "B")
+        self._int_pin = Pin(int_pin, Pin.IN, Pin.PULL_UP)
+        self._int_pin.irq(handler=self._on_interrupt, trigger=Pin.IRQ_FALLING)
+        # Pick up anything latched before the IRQ was bound
+        self._pending = True
+
+    # -------------------------------------------------------
+    # disable_events()
+    #
+    # Leaves event mode and unbinds the INT line.
+    def disable_events(self):
+        """!
+        Stop listening to the INT line and drop queued events
+
+        @return **Void** Nothing
+        """
+        if self._int_pin is not None:
+            self._int_pin.irq(handler=None)
+            self._int_pin = None
+        self._events = None
+        self._pending = False
+
+    @property
+    def events_enabled(self):
+        """!
+        True if enable_events() has been called
+
+        @return **bool** event mode active
+        """
+        return self._events is not None
+
+    def _on_interrupt(self, pin):
+        self._pending = True
+
+    # -------------------------------------------------------
+    # service()
+    #
+    # Call from the main loop in event mode. Reads BUTTON_STATUS
+    # only if the INT line fired since the last call.
+    def service(self):
+        """!
+        Read BUTTON_STATUS if the INT line fired, queue the event and clear it
+
+        @return **int** number of events queued
+        """
+        if not self._pending:
+            return 0
+        self._pending = False
+        status = self.read_status()
+        if not status.event_available:
+            return 0
+        queued = 1 if self._events.put(status.raw) else 0
+        self.consume_event(status)
+        # With write-behind the clear is still queued; send it so the line
+        # can go high before we look at it
+        self._i2c.flush(self.address)
+        # The line stays low if another event landed while we were reading
+        if self._int_pin.value() == 0:
+            self._pending = True
+        return queued
+
+    # -------------------------------------------------------
+    # get_event(status)
+    #
+    # Returns the oldest queued event, or None.
+    def get_event(self, status=None):
+        """!
+        Remove the oldest event queued by service()
+
+        @param status: ButtonStatus to decode the event into. If not
+                provided, a new one is created.
+
+        @return **ButtonStatus** the event's status flags, or None if
+                no event is queued or event mode is off
+        """
+        if self._events is None:
+            return None
+        raw = self._events.get()
+        if raw is None:
+            return None
+        if status is None:
+            status = ButtonStatus()
+        return status.decode(raw)
+
     # -------------------------------------------------------
     # reset_interrupt_config()
     #
@@ -448,6 +671,9 @@ class QwiicButton(object):
         self.is_pressed = 0
         # Clear the BUTTON_STATUS register by writing a 0
         self._i2c.writeByte(self.address, self.BUTTON_STATUS, 0x00)
+        # Don't trust cached register contents after a reset
+        self._i2c.invalidate_shadow(self.address)
+        self._led_effect = None
     
     # -------------------------------------------------------
     # is_pressed_queue_full()
@@ -545,6 +771,47 @@ class QwiicButton(object):
         self._i2c.writeByte(self.address, self.PRESSED_QUEUE_STATUS, pressed_queue_stat)
         return temp_data
     
+    # ---------------------------------------------------------
+    # drain_pressed(out, start)
+    #
+    # Pops every queued press timestamp into out, oldest first.
+    def drain_pressed(self, out, start=0, read_ms=None):
+        """!
+        Empty the pressed queue into a caller provided array
+
+        @param out: array('I') to store the PRESSED_QUEUE_BACK values in
+        @param start: index in out to store the first entry at
+        @param read_ms: optional array('I') to store the time.ticks_ms()
+                each entry was read at, so its age can be turned into a time
+
+        @return **int** number of entries stored
+        """
+        return self._drain(self.PRESSED_QUEUE_STATUS, out, start, read_ms)
+
+    # ---------------------------------------------------------
+    # _drain(status_register, out, start, read_ms)
+    #
+    # The queue status register is followed by the front and back
+    # timestamps, so one 9 byte read gets the empty flag and the oldest
+    # entry, and one write pops it: two transactions per entry.
+    def _drain(self, status_register, out, start, read_ms=None):
+        buf = self._queue_buf
+        count = 0
+        index = start
+        while index < len(out):
+            self._i2c.readInto(self.address, status_register, buf)
+            # is_empty bit
+            if buf[0] & 0x02:
+                break
+            out[index] = buf[5] | (buf[6] << 8) | (buf[7] << 16) | (buf[8] << 24)
+            if read_ms is not None:
+                read_ms[index] = time.ticks_ms()
+            # Set pop_request bit to 1
+            self._i2c.writeByte(self.address, status_register, buf[0] | 0x01)
+            index += 1
+            count += 1
+        return count
+
     # ---------------------------------------------------------
     # is_clicked_queue_full()
     #
@@ -641,6 +908,23 @@ class QwiicButton(object):
         self._i2c.writeByte(self.address, self.CLICKED_QUEUE_STATUS, clicked_queue_stat)
         return temp_data
 
+    # -------------------------------------------------------------
+    # drain_clicked(out, start)
+    #
+    # Pops every queued click timestamp into out, oldest first.
+    def drain_clicked(self, out, start=0, read_ms=None):
+        """!
+        Empty the clicked queue into a caller provided array
+
+        @param out: array('I') to store the CLICKED_QUEUE_BACK values in
+        @param start: index in out to store the first entry at
+        @param read_ms: optional array('I') to store the time.ticks_ms()
+                each entry was read at, so its age can be turned into a time
+
+        @return **int** number of entries stored
+        """
+        return self._drain(self.CLICKED_QUEUE_STATUS, out, start, read_ms)
+
     # -------------------------------------------------------------
     # LED_config(brightness, cycle_time, off_time, granularity)
     #
@@ -670,6 +954,10 @@ class QwiicButton(object):
         self._i2c.writeWord(self.address, self.LED_PULSE_OFF_TIME, off_time)
         # Write granularity
         self._i2c.writeByte(self.address, self.LED_PULSE_GRANULARITY, granularity)
+        self._led_effect = ("config", brightness, cycle_time, off_time, granularity)
+        # Whatever was written last wins over a pending LED_ack() restore
+        self._led_acking = False
+        self._led_restore = None
     
     # --------------------------------------------------------------
     # LED_off()
@@ -701,6 +989,149 @@ class QwiicButton(object):
         """
         self.LED_config(brightness, 0, 0)
 
+    # --------------------------------------------------------------
+    # LED_effect(name, brightness, cycle_time, off_time, granularity)
+    #
+    # Programs the button's pulse engine unless the same effect is
+    # already running, so effects can be requested every loop without
+    # any bus traffic once they are set up.
+    def LED_effect(self, name, brightness, cycle_time=0, off_time=0, granularity=1):
+        """!
+        Run an LED effect on the button's pulse engine
+
+        @param name: effect name, reported by LED_active_effect()
+        @param brightness: between 0 (led off) and 255 (max brightness)
+        @param cycle_time: total pulse cycle in milliseconds, 0 for steady
+        @param off_time: off time between pulses in milliseconds
+        @param granularity: brightness steps per pulse update
+
+        @return **bool** True if the registers were written
+        """
+        effect = (name, brightness, cycle_time, off_time, granularity)
+        # An LED_ack() in progress will switch to this effect when it ends
+        if self._led_acking:
+            self._led_restore = effect
+            return False
+        if effect == self._led_effect:
+            return False
+        self.LED_config(brightness, cycle_time, off_time, granularity)
+        self._led_effect = effect
+        return True
+
+    # --------------------------------------------------------------
+    # LED_active_effect()
+    #
+    # Returns the name of the running LED effect.
+    def LED_active_effect(self):
+        """!
+        Name of the LED effect currently programmed
+
+        @return **str** effect name, or None if unknown
+        """
+        if self._led_effect is None:
+            return None
+        return self._led_effect[0]
+
+    # --------------------------------------------------------------
+    # LED_breathe(brightness, cycle_time, off_time)
+    #
+    # Smoothly fades the LED up and down.
+    def LED_breathe(self, brightness=255, cycle_time=2000, off_time=200):
+        """!
+        Fade the LED up and down continuously
+
+        @param brightness: peak brightness, 0 to 255
+        @param cycle_time: fade up and down time in milliseconds
+        @param off_time: off time between breaths in milliseconds
+
+        @return **bool** True if the registers were written
+        """
+        return self.LED_effect("breathe", brightness, cycle_time, off_time, 1)
+
+    # --------------------------------------------------------------
+    # LED_blink(brightness, on_time, off_time)
+    #
+    # Blinks the LED. The pulse engine always ramps, so a granularity
+    # equal to the brightness makes it reach full brightness in one step.
+    def LED_blink(self, brightness=255, on_time=250, off_time=250):
+        """!
+        Blink the LED on and off
+
+        @param brightness: on brightness, 1 to 255
+        @param on_time: on time in milliseconds
+        @param off_time: off time in milliseconds
+
+        @return **bool** True if the registers were written
+        """
+        return self.LED_effect("blink", brightness, on_time, off_time, max(1, brightness))
+
+    # --------------------------------------------------------------
+    # LED_heartbeat(brightness, bpm)
+    #
+    # Short pulse followed by a long pause.
+    def LED_heartbeat(self, brightness=255, bpm=60):
+        """!
+        Pulse the LED briefly once per beat
+
+        @param brightness: peak brightness, 0 to 255
+        @param bpm: beats per minute
+
+        @return **bool** True if the registers were written
+        """
+        if bpm <= 0:
+            raise ValueError("bpm must be positive")
+        period = 60000 // bpm
+        cycle_time = period // 4
+        return self.LED_effect("heartbeat", brightness, cycle_time, period - cycle_time, 4)
+
+    # --------------------------------------------------------------
+    # LED_ack(brightness, duration)
+    #
+    # Flashes the LED once, then LED_update() puts the previous effect
+    # back after duration milliseconds.
+    def LED_ack(self, brightness=255, duration=150):
+        """!
+        Flash the LED once as feedback, then restore the running effect
+
+        @param brightness: flash brightness, 1 to 255
+        @param duration: flash length in milliseconds
+
+        @return **Void** Nothing
+        """
+        restore = self._led_restore if self._led_acking else self._led_effect
+        ack = ("ack", brightness, duration, 0, max(1, brightness))
+        if ack != self._led_effect:
+            self.LED_config(brightness, duration, 0, max(1, brightness))
+            self._led_effect = ack
+        # None if nothing was known to be running; LED_update() then turns
+        # the LED off
+        self._led_restore = restore
+        self._led_acking = True
+        self._led_revert_ms = time.ticks_add(time.ticks_ms(), duration)
+
+    # --------------------------------------------------------------
+    # LED_update()
+    #
+    # Call from the main loop; only does bus traffic when an LED_ack()
+    # flash has to end.
+    def LED_update(self):
+        """!
+        Restore the previous LED effect once an LED_ack() flash is over
+
+        @return **bool** True if the registers were written
+        """
+        if not self._led_acking:
+            return False
+        if time.ticks_diff(time.ticks_ms(), self._led_revert_ms) < 0:
+            return False
+        restore = self._led_restore
+        self._led_acking = False
+        self._led_restore = None
+        if restore is None or restore[0] == "ack":
+            self.LED_off()
+            return True
+        return self.LED_effect(*restore)
+
 def button_example():
 
     print("\nSparkFun Qwiic Button Example 1")
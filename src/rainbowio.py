@@ -9,6 +9,8 @@ Not supported by all boards.
 
 * Author(s): Kattni Rembor, Carter Nelson
 """
+from array import array
+from fixedpoint import lerp
 
 
 def colorwheel(color_value):
@@ -103,16 +105,14 @@ def custom_colorwheel(color_value, start_color, middle_color, end_color):
     
     if color_value <= 127:
         # Interpolate from start to middle (0-127)
-        ratio = color_value / 127.0
-        r = int(start_r + (middle_r - start_r) * ratio)
-        g = int(start_g + (middle_g - start_g) * ratio)
-        b = int(start_b + (middle_b - start_b) * ratio)
+        r = lerp(start_r, middle_r, color_value, 127)
+        g = lerp(start_g, middle_g, color_value, 127)
+        b = lerp(start_b, middle_b, color_value, 127)
     else:
         # Interpolate from middle to end (128-255)
-        ratio = (color_value - 127) / 128.0
-        r = int(middle_r + (end_r - middle_r) * ratio)
-        g = int(middle_g + (end_g - middle_g) * ratio)
-        b = int(middle_b + (end_b - middle_b) * ratio)
+        r = lerp(middle_r, end_r, color_value - 127, 128)
+        g = lerp(middle_g, end_g, color_value - 127, 128)
+        b = lerp(middle_b, end_b, color_value - 127, 128)
     
     # Clamp values to 0-255 range
     r = max(0, min(255, r))
@@ -142,10 +142,9 @@ def two_color_gradient(color_value, start_color, end_color):
     end_r, end_g, end_b = end_color
     
     # Linear interpolation
-    ratio = color_value / 255.0
-    r = int(start_r + (end_r - start_r) * ratio)
-    g = int(start_g + (end_g - start_g) * ratio)
-    b = int(start_b + (end_b - start_b) * ratio)
+    r = lerp(start_r, end_r, color_value, 255)
+    g = lerp(start_g, end_g, color_value, 255)
+    b = lerp(start_b, end_b, color_value, 255)
     
     # Clamp values to 0-255 range
     r = max(0, min(255, r))
@@ -155,6 +154,123 @@ def two_color_gradient(color_value, start_color, end_color):
     return r << 16 | g << 8 | b, [r << 16, g << 8, b]
 
 
+class Gradient:
+    """
+    A two- or three-color gradient baked into a 256-entry table of packed
+    RGB values, so looking up a color is a single index with no float math
+    and no allocation.
+
+    :param tuple color1: RGB tuple for value 0
+    :param tuple color2: RGB tuple for value 255, or for value 127 if
+        ``color3`` is given
+    :param tuple color3: optional RGB tuple for value 255
+    """
+
+    def __init__(self, color1, color2, color3=None):
+        self.table = array("I", [0] * 256)
+        self.set_colors(color1, color2, color3)
+
+    def set_colors(self, color1, color2, color3=None):
+        """
+        Rebuild the table for new colors.
+
+        :param tuple color1: RGB tuple for value 0
+        :param tuple color2: RGB tuple for value 255, or for value 127 if
+            ``color3`` is given
+        :param tuple color3: optional RGB tuple for value 255
+        """
+        table = self.table
+        for i in range(256):
+            if color3 is None:
+                table[i] = two_color_gradient(i, color1, color2)[0]
+            else:
+                table[i] = custom_colorwheel(i, color1, color2, color3)[0]
+
+    def __getitem__(self, color_value):
+        """
+        :param int color_value: 0-255, clamped to that range
+        :return: packed RGB integer
+        """
+        if color_value < 0:
+            return self.table[0]
+        if color_value > 255:
+            return self.table[255]
+        return self.table[int(color_value)]
+
+    def __len__(self):
+        return 256
+
+
+def _put_pixel(buf, offset, color, pixel_order, scale):
+    # Write one packed RGB color into buf in pixel order, scaled by scale/256
+    r = (color >> 16) & 0xFF
+    g = (color >> 8) & 0xFF
+    b = color & 0xFF
+    if scale < 256:
+        r = (r * scale) >> 8
+        g = (g * scale) >> 8
+        b = (b * scale) >> 8
+    buf[offset + pixel_order[0]] = r
+    buf[offset + pixel_order[1]] = g
+    buf[offset + pixel_order[2]] = b
+
+
+def render_gradient(buf, gradient, count, offset=0, pixel_order=(0, 1, 2), bpp=3, scale=256):
+    """
+    Spread a gradient across a strip in one pass, writing straight into an
+    encoded frame buffer such as the one `SeeSaw_NeoPixel.load` takes.
+    The first pixel gets gradient value ``offset`` and the last gets
+    ``offset + 255``, wrapping around the table.
+
+    :param bytearray buf: frame buffer of at least ``count * bpp`` bytes
+    :param Gradient gradient: gradient to sample
+    :param int count: number of pixels to render
+    :param int offset: 0-255 shift of the gradient along the strip
+    :param tuple pixel_order: byte positions of red, green and blue within a
+        pixel, e.g. ``seesaw_neopixel.GRB``
+    :param int bpp: bytes per pixel. Extra bytes such as white are left as-is.
+    :param int scale: brightness, 0-256 where 256 is full
+    """
+    table = gradient.table
+    offset = int(offset)
+    last = count - 1 if count > 1 else 1
+    for i in range(count):
+        color = table[(offset + (i * 255) // last) & 0xFF]
+        _put_pixel(buf, i * bpp, color, pixel_order, scale)
+
+
+def render_level(buf, gradient, count, level, pixel_order=(0, 1, 2), bpp=3, scale=256):
+    """
+    Render a fill level marker: pixels below ``level`` show the gradient
+    color for their position, the pixel the level falls inside is dimmed in
+    proportion, and the rest are off.
+
+    :param bytearray buf: frame buffer of at least ``count * bpp`` bytes
+    :param Gradient gradient: gradient to sample
+    :param int count: number of pixels to render
+    :param int level: 0-255 fill level
+    :param tuple pixel_order: byte positions of red, green and blue within a
+        pixel, e.g. ``seesaw_neopixel.GRB``
+    :param int bpp: bytes per pixel. Extra bytes such as white are left as-is.
+    :param int scale: brightness, 0-256 where 256 is full
+    """
+    table = gradient.table
+    # Fill position in 1/256ths of a pixel
+    lit = (int(level) * count * 256) // 255
+    full = lit >> 8
+    partial = lit & 0xFF
+    last = count - 1 if count > 1 else 1
+    for i in range(count):
+        if i < full:
+            pixel_scale = scale
+        elif i == full:
+            pixel_scale = (scale * partial) >> 8
+        else:
+            pixel_scale = 0
+        color = table[(i * 255) // last]
+        _put_pixel(buf, i * bpp, color, pixel_order, pixel_scale)
+
+
 # Predefined color constants for easy use
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: MIT
+"""
+`ringbuffer`
+====================================================
+
+Bounded FIFO of small integers, used to hand input events from interrupt
+handlers to the main loop without allocating.
+"""
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size FIFO of unsigned integers. When the buffer is full new
+    entries are dropped and counted in ``overflows``.
+
+    :param int size: Number of entries the buffer can hold
+    :param str typecode: ``array`` typecode for the entries (default ``"H"``)"""
+
+    def __init__(self, size, typecode="H"):
+        self._data = array(typecode, [0] * size)
+        self._size = size
+        self._head = 0
+        self._count = 0
+        self.overflows = 0
+
+    def __len__(self):
+        return self._count
+
+    def put(self, value):
+        """Append a value. Returns False if the buffer was full."""
+        if self._count == self._size:
+            self.overflows += 1
+            return False
+        index = self._head + self._count
+        if index >= self._size:
+            index -= self._size
+        self._data[index] = value
+        self._count += 1
+        return True
+
+    def get(self):
+        """Remove and return the oldest value, or None if the buffer is empty"""
+        if self._count == 0:
+            return None
+        value = self._data[self._head]
+        self._head += 1
+        if self._head == self._size:
+            self._head = 0
+        self._count -= 1
+        return value
+
+    def clear(self):
+        """Drop every queued value"""
+        self._head = 0
+        self._count = 0
@@ -26,7 +26,7 @@ Implementation Notes
 
 import struct
 import time
-from mp_i2c import qwiic_i2c
+from mp_i2c import get_shared_bus, release_shared_bus
 
 try:
     from micropython import const
@@ -79,6 +79,8 @@ _ADC_WINMODE = const(0x04)
 _ADC_WINTHRESH = const(0x05)
 _ADC_CHANNEL_OFFSET = const(0x07)
 
+_ADC_STATUS_WINMON = const(0x02)
+
 _SERCOM_STATUS = const(0x00)
 _SERCOM_INTEN = const(0x02)
 _SERCOM_INTENCLR = const(0x03)
@@ -94,6 +96,10 @@ _NEOPIXEL_SHOW = const(0x05)
 
 _TOUCH_CHANNEL_OFFSET = const(0x10)
 
+# Largest write to an offset-addressed buffer register, such as the NeoPixel
+# buffer, that the seesaw takes in one transaction, including the 2-byte offset
+_BUFFER_TRANSFER_SIZE = const(24)
+
 _SAMD09_HW_ID_CODE = const(0x55)
 _ATTINY8X7_HW_ID_CODE = const(0x87)
 _EEPROM_I2C_ADDR = const(0x3F)
@@ -104,6 +110,11 @@ _ENCODER_INTENCLR = const(0x20)
 _ENCODER_POSITION = const(0x30)
 _ENCODER_DELTA = const(0x40)
 
+# Registers that don't wait on an ADC conversion still need the seesaw to
+# prepare the reply after the register select; the Arduino seesaw library
+# waits 250 us instead of the 8 ms default
+STATUS_READ_DELAY = 0.00025
+
 # TODO: update when we get real PID
 _CRICKIT_PID = const(9999)
 _ROBOHATMM1_PID = const(9998)
@@ -116,17 +127,37 @@ class Seesaw:
     :param int sda: SDA pin number (default 12)
     :param int scl: SCL pin number (default 13)
     :param int freq: I2C frequency (default 100000)
-    :param bool reset: Whether to do a software reset on init"""
+    :param bool reset: Whether to do a software reset on init
+    :param i2c_driver: An existing i2c driver object. If not provided the
+        shared bus for ``sda``/``scl``/``freq`` is used."""
 
     INPUT = const(0x00)
     OUTPUT = const(0x01)
     INPUT_PULLUP = const(0x02)
     INPUT_PULLDOWN = const(0x03)
 
-    def __init__(self, addr=0x49, sda=12, scl=13, freq=100000, reset=True):
+    # ADC window monitor modes, as in the SAMD ADC WINCTRL register
+    ADC_WINDOW_DISABLED = const(0x00)
+    ADC_WINDOW_ABOVE = const(0x01)
+    ADC_WINDOW_BELOW = const(0x02)
+    ADC_WINDOW_INSIDE = const(0x03)
+    ADC_WINDOW_OUTSIDE = const(0x04)
+
+    def __init__(self, addr=0x49, sda=12, scl=13, freq=100000, reset=True, i2c_driver=None):
         self.device_address = addr
-        self.i2c_device = qwiic_i2c(sda=sda, scl=scl, freq=freq)
-        
+        self._header = bytearray(2)
+        self._adc_buf = bytearray(2)
+        self._status_buf = bytearray(1)
+        self._transfer_buf = bytearray(_BUFFER_TRANSFER_SIZE)
+        self._transfer_mv = memoryview(self._transfer_buf)
+        self._owns_bus = i2c_driver is None
+        if self._owns_bus:
+            self.i2c_device = get_shared_bus(sda=sda, scl=scl, freq=freq)
+            if self.i2c_device is None:
+                raise RuntimeError("Unable to open I2C bus")
+        else:
+            self.i2c_device = i2c_driver
+
         if reset:
             self.sw_reset()
         
@@ -165,6 +196,12 @@ class Seesaw:
                 pwm_width = 8
             self.pin_mapping = ATtiny8x7_Pinmap
 
+    def deinit(self):
+        """Release the shared I2C bus"""
+        if self._owns_bus and self.i2c_device is not None:
+            release_shared_bus(self.i2c_device)
+        self.i2c_device = None
+
     def sw_reset(self, post_reset_delay=0.5):
         """Trigger a software reset of the SeeSaw chip"""
         self.write8(_STATUS_BASE, _STATUS_SWRST, 0xFF)
@@ -232,9 +269,38 @@ class Seesaw:
         self.read(_GPIO_BASE, _GPIO_INTFLAG, buf, delay=delay)
         return struct.unpack(">I", buf)[0]
 
+    def set_analog_window(self, low, high, mode=ADC_WINDOW_OUTSIDE):
+        """Program the ADC window comparator. In ``ADC_WINDOW_OUTSIDE`` mode the
+        window flag is raised once a conversion falls outside ``low``..``high``.
+
+        Window monitoring depends on the seesaw firmware; boards that don't
+        implement it never raise the flag."""
+        cmd = struct.pack(">HH", high, low)
+        self.write(_ADC_BASE, _ADC_WINTHRESH, cmd)
+        self.write8(_ADC_BASE, _ADC_WINMODE, mode)
+
+    def enable_analog_interrupt(self):
+        """Drive the INT line when the ADC window flag is raised"""
+        self.write8(_ADC_BASE, _ADC_INTEN, 0x01)
+
+    def disable_analog_interrupt(self):
+        """Stop driving the INT line from the ADC window flag"""
+        self.write8(_ADC_BASE, _ADC_INTENCLR, 0x01)
+
+    def get_analog_window_flag(self):
+        """Read and clear the ADC window flag"""
+        self.read(_ADC_BASE, _ADC_STATUS, self._status_buf, delay=STATUS_READ_DELAY)
+        return (self._status_buf[0] & _ADC_STATUS_WINMON) != 0
+
     def analog_read(self, pin, delay=0.008):
         """Read the value of an analog pin by number"""
-        buf = bytearray(2)
+        return self.analog_read_finish(
+            self.analog_read_start(pin, int(delay * 1000000))
+        )
+
+    def analog_read_start(self, pin, delay_us=8000):
+        """Start an ADC conversion on an analog pin by number and return a
+        handle for :meth:`analog_read_finish`"""
         if pin not in self.pin_mapping.analog_pins:
             raise ValueError("Invalid ADC pin")
 
@@ -243,9 +309,12 @@ class Seesaw:
         elif self.chip_id == _SAMD09_HW_ID_CODE:
             offset = self.pin_mapping.analog_pins.index(pin)
 
-        self.read(_ADC_BASE, _ADC_CHANNEL_OFFSET + offset, buf, delay)
-        ret = struct.unpack(">H", buf)[0]
-        return ret
+        return self.read_start(_ADC_BASE, _ADC_CHANNEL_OFFSET + offset, delay_us)
+
+    def analog_read_finish(self, handle):
+        """Collect the result of :meth:`analog_read_start`"""
+        buf = self.read_finish(handle, self._adc_buf)
+        return (buf[0] << 8) | buf[1]
 
     def touch_read(self, pin):
         """Read the value of a touch pin by number"""
@@ -432,26 +501,67 @@ class Seesaw:
         """Read an arbitrary I2C register range on the device"""
         if buf is None:
             buf = bytearray(1)
-        
-        # First write the register address
-        write_data = [reg_base, reg]
-        
-        # Use write_read_block to write register and read data
-        result = self.i2c_device.write_read_block(self.device_address, write_data, len(buf))
-        
-        # Copy result into buf
-        for i in range(len(buf)):
-            if i < len(result):
-                buf[i] = result[i]
-        
-        time.sleep(delay)
+
+        self.read_finish(self.read_start(reg_base, reg, int(delay * 1000000)), buf)
+
+    # Split-phase reads
+    #
+    # The seesaw needs time between the register select and the read, 8 ms for
+    # an ADC conversion. read_start() sends the register select and returns
+    # straight away; the handle is the time.ticks_us() deadline after which the
+    # result can be collected with read_finish(). The bus is free in between, so
+    # other devices can be serviced during the conversion. Only one read may be
+    # outstanding per seesaw, since the next register select replaces it.
+
+    def read_start(self, reg_base, reg, delay_us=8000):
+        """Select a register to read and return a handle for :meth:`read_finish`"""
+        self._header[0] = reg_base
+        self._header[1] = reg
+        self.i2c_device.i2cbus.writeto(self.device_address, self._header)
+        return time.ticks_add(time.ticks_us(), delay_us)
+
+    def read_ready(self, handle):
+        """Whether the read started with :meth:`read_start` can be collected
+        without waiting"""
+        return time.ticks_diff(time.ticks_us(), handle) >= 0
+
+    def read_finish(self, handle, buf):
+        """Wait out the rest of the read delay if needed and read into ``buf``"""
+        remaining = time.ticks_diff(handle, time.ticks_us())
+        if remaining > 0:
+            time.sleep_us(remaining)
+        self.i2c_device.read_into(self.device_address, None, buf)
+        return buf
+
+    def write_buffer(self, reg_base, reg, offset, buf):
+        """Write ``buf`` at byte ``offset`` of an offset-addressed buffer register,
+        split into as few transfers as the seesaw accepts"""
+        lo = 0
+        hi = len(buf)
+        src = memoryview(buf)
+        out = self._transfer_buf
+        step = _BUFFER_TRANSFER_SIZE - 2
+        while lo < hi:
+            count = min(step, hi - lo)
+            start = offset + lo
+            out[0] = start >> 8
+            out[1] = start & 0xFF
+            out[2:2 + count] = src[lo:lo + count]
+            self.write(reg_base, reg, self._transfer_mv[:2 + count])
+            lo += count
 
     def write(self, reg_base, reg, buf=None):
         """Write an arbitrary I2C register range on the device"""
-        write_data = [reg_base, reg]
-        
-        if buf is not None:
-            write_data.extend(buf)
-        
-        # Use write_block to send all data at once
-        self.i2c_device.i2cbus.writeto(self.device_address, bytes(write_data))
\ No newline at end of file
+        if not buf:
+            self._header[0] = reg_base
+            self._header[1] = reg
+            self.i2c_device.i2cbus.writeto(self.device_address, self._header)
+            return
+
+        if not isinstance(buf, (bytes, bytearray, memoryview)):
+            buf = bytes(buf)
+        # The seesaw register address is the 16-bit big-endian memory address,
+        # so the payload goes out without being copied behind a header
+        self.i2c_device.i2cbus.writeto_mem(
+            self.device_address, (reg_base << 8) | reg, buf, addrsize=16
+        )
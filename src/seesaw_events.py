@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MIT
+"""
+`seesaw_events`
+====================================================
+
+Interrupt-driven edge events for digital inputs on a seesaw.
+
+Instead of polling every pin with `Seesaw.digital_read`, which reads the whole
+bulk register and sleeps for each pin, the seesaw GPIO interrupt is enabled for
+a set of pins and its INT line is bound to a `machine.Pin` IRQ. The IRQ handler
+only records that the line fired. `SeesawInputEvents.service` then reads
+``_GPIO_INTFLAG`` and ``_GPIO_BULK`` once and queues one event per pin that
+changed, so idle inputs cost no bus traffic at all.
+"""
+from ringbuffer import RingBuffer
+from seesaw import Seesaw, STATUS_READ_DELAY
+
+# GPIO registers don't need an ADC conversion, so use the short read delay
+_GPIO_READ_DELAY = STATUS_READ_DELAY
+
+RISING = 1
+"""Event level for a pin that went high"""
+FALLING = 0
+"""Event level for a pin that went low"""
+
+
+def event_pin(event):
+    """The pin number of an event returned by `SeesawInputEvents.get`"""
+    return event >> 1
+
+
+def event_level(event):
+    """The new level of the pin, `RISING` or `FALLING`"""
+    return event & 1
+
+
+class SeesawInputEvents:
+    """Queue edge events for a set of seesaw inputs on the 'A' port
+
+    :param ~seesaw.Seesaw seesaw: The device
+    :param pins: Pin numbers to watch, all below 32
+    :param int int_pin: Host pin wired to the seesaw INT line. If None the
+        interrupt flags are polled on every `service` call instead.
+    :param int mode: Seesaw pin mode for the inputs (default INPUT_PULLUP)
+    :param int size: Number of events buffered between `get` calls
+    :param callback: Optional function called from `service` with each event"""
+
+    def __init__(
+        self, seesaw, pins, int_pin=None, *, mode=Seesaw.INPUT_PULLUP, size=16, callback=None
+    ):
+        self._seesaw = seesaw
+        self._mask = 0
+        for pin in pins:
+            if pin >= 32:
+                raise ValueError("Only 'A' port pins are supported")
+            self._mask |= 1 << pin
+        self._events = RingBuffer(size)
+        self._callback = callback
+
+        seesaw.pin_mode_bulk(self._mask, mode)
+        self._state = seesaw.digital_read_bulk(self._mask, delay=_GPIO_READ_DELAY)
+        seesaw.set_GPIO_interrupts(self._mask, True)
+        # Discard anything latched before we started listening
+        seesaw.get_GPIO_interrupt_flag(delay=_GPIO_READ_DELAY)
+
+        self._int_pin = None
+        self._pending = False
+        if int_pin is not None:
+            from machine import Pin
+
+            self._int_pin = Pin(int_pin, Pin.IN, Pin.PULL_UP)
+            self._int_pin.irq(handler=self._on_interrupt, trigger=Pin.IRQ_FALLING)
+
+    def _on_interrupt(self, pin):
+        self._pending = True
+
+    def deinit(self):
+        """Stop listening for interrupts"""
+        if self._int_pin is not None:
+            self._int_pin.irq(handler=None)
+            self._int_pin = None
+        self._seesaw.set_GPIO_interrupts(self._mask, False)
+
+    @property
+    def state(self):
+        """Bitmask of the watched pins' levels as of the last `service` call"""
+        return self._state
+
+    def service(self):
+        """Read the interrupt flags and pin levels once if the INT line fired
+        and queue an event for each pin that changed. Call this from the main
+        loop. Returns the number of events queued."""
+        if self._int_pin is not None:
+            if not self._pending:
+                return 0
+            self._pending = False
+
+        flags = self._seesaw.get_GPIO_interrupt_flag(delay=_GPIO_READ_DELAY) & self._mask
+        if not flags:
+            return 0
+        state = self._seesaw.digital_read_bulk(self._mask, delay=_GPIO_READ_DELAY)
+
+        # A pin that is flagged but reads back at its old level changed twice
+        # between services, so report both edges
+        count = 0
+        pin = 0
+        while flags:
+            bit = 1 << pin
+            if flags & bit:
+                flags &= ~bit
+                level = 1 if state & bit else 0
+                if not (state ^ self._state) & bit:
+                    count += self._queue((pin << 1) | (level ^ 1))
+                count += self._queue((pin << 1) | level)
+            pin += 1
+        self._state = state
+
+        # The line stays low if another change landed while we were reading
+        if self._int_pin is not None and self._int_pin.value() == 0:
+            self._pending = True
+        return count
+
+    def _queue(self, event):
+        if self._callback is not None:
+            self._callback(event)
+        return 1 if self._events.put(event) else 0
+
+    def get(self):
+        """Return the oldest queued event, or None. Decode it with
+        `event_pin` and `event_level`."""
+        return self._events.get()
+
+    def __len__(self):
+        return len(self._events)
@@ -9,6 +9,7 @@
 ====================================================
 """
 import struct
+from fixedpoint import brightness_table
 
 try:
     from micropython import const
@@ -26,6 +27,10 @@ _NEOPIXEL_BUF_LENGTH = const(0x03)
 _NEOPIXEL_BUF = const(0x04)
 _NEOPIXEL_SHOW = const(0x05)
 
+# Clean bytes between two dirty spans are resent rather than starting a new
+# buffer write when the gap is no longer than the header a new write costs
+_SPAN_MERGE_GAP = const(4)
+
 # Pixel color order constants
 RGB = (0, 1, 2)
 """Red Green Blue"""
@@ -37,6 +42,11 @@ GRBW = (1, 0, 2, 3)
 """Green Red Blue White"""
 
 
+def _brightness_scale(brightness):
+    # 0-256 scale matching _encode, which leaves colors alone from 0.99 up
+    return 256 if brightness >= 0.99 else int(brightness * 256)
+
+
 class SeeSaw_NeoPixel:
     """Control NeoPixels connected to a seesaw
 
@@ -60,13 +70,14 @@ class SeeSaw_NeoPixel:
         auto_write=True,
         pixel_order=None
     ):
-        # TODO: brightness not yet implemented.
         self._seesaw = seesaw
         self._pin = pin
         self._bpp = bpp
         self.auto_write = auto_write
         self._n = n
         self._brightness = min(max(brightness, 0.0), 1.0)
+        self._brightness_table = brightness_table(self._brightness)
+        self._brightness_scale = _brightness_scale(self._brightness)
         self._pixel_order = GRBW if pixel_order is None else pixel_order
 
         cmd = bytearray([pin])
@@ -75,6 +86,19 @@ class SeeSaw_NeoPixel:
         self._seesaw.write(_NEOPIXEL_BASE, _NEOPIXEL_BUF_LENGTH, cmd)
         self._pre_brightness_color = [None] * n
 
+        # Local frame buffer. Setting pixels only touches memory; show() sends
+        # the pixels that changed since the last show, in as few buffer writes
+        # as the seesaw allows, and does nothing if none did.
+        self._buffer = bytearray(n * self._bpp)
+        self._buffer_mv = memoryview(self._buffer)
+        self._pixel = bytearray(self._bpp)
+        self._dirty = bytearray(n)
+        self._dirty_count = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        # The device buffer contents are unknown until the first show
+        self.invalidate()
+
     @property
     def brightness(self):
         """Overall brightness of the pixel"""
@@ -84,6 +108,8 @@ class SeeSaw_NeoPixel:
     def brightness(self, brightness):
         # pylint: disable=attribute-defined-outside-init
         self._brightness = min(max(brightness, 0.0), 1.0)
+        self._brightness_table = brightness_table(self._brightness)
+        self._brightness_scale = _brightness_scale(self._brightness)
 
         # Suppress auto_write while updating brightness.
         current_auto_write = self.auto_write
@@ -95,17 +121,30 @@ class SeeSaw_NeoPixel:
             self.show()
         self.auto_write = current_auto_write
 
+    @property
+    def brightness_scale(self):
+        """Brightness as a 0-256 ``scale`` for `rainbowio.render_gradient` and
+        `rainbowio.render_level`, so frames given to `load` match `fill`"""
+        return self._brightness_scale
+
+    @property
+    def pixel_order(self):
+        """Byte positions of each color within a pixel"""
+        return self._pixel_order
+
+    @property
+    def bpp(self):
+        """Bytes per pixel"""
+        return self._bpp
+
     def deinit(self):
         pass
 
     def __len__(self):
         return self._n
 
-    def __setitem__(self, key, color):
-        """Set one pixel to a new value"""
-        cmd = bytearray(2 + self._bpp)
-        struct.pack_into(">H", cmd, 0, key * self._bpp)
-        
+    def _encode(self, color):
+        """Encode a color into the one-pixel scratch buffer"""
         # Handle both integer color values and tuple/list color values
         if isinstance(color, int):
             # Integer color value (24-bit RGB or 32-bit RGBW)
@@ -140,8 +179,6 @@ class SeeSaw_NeoPixel:
             except (ValueError, TypeError):
                 raise ValueError("Color must be an integer or sequence of RGB(W) values")
 
-        self._pre_brightness_color[key] = color
-
         # If all components are the same and we have a white pixel then use it
         # instead of the individual components.
         if self._bpp == 4 and r == g == b and w == 0:
@@ -150,41 +187,137 @@ class SeeSaw_NeoPixel:
             g = 0
             b = 0
 
-        if self.brightness < 0.99:
-            r = int(r * self.brightness)
-            g = int(g * self.brightness)
-            b = int(b * self.brightness)
+        if self._brightness < 0.99:
+            table = self._brightness_table
+            r = table[r]
+            g = table[g]
+            b = table[b]
             if self._bpp == 4:
-                w = int(w * self.brightness)
+                w = table[w]
 
         # Store colors in correct slots
-        r = int(r)
-        g = int(g)
-        b = int(b)
-        cmd[2 + self._pixel_order[0]] = r
-        cmd[2 + self._pixel_order[1]] = g
-        cmd[2 + self._pixel_order[2]] = b
+        pixel = self._pixel
+        pixel[self._pixel_order[0]] = int(r)
+        pixel[self._pixel_order[1]] = int(g)
+        pixel[self._pixel_order[2]] = int(b)
         if self._bpp == 4:
-            cmd[2 + self._pixel_order[3]] = w
+            pixel[self._pixel_order[3]] = w
+        return pixel
+
+    def _index(self, key):
+        if key < 0:
+            key += self._n
+        if not 0 <= key < self._n:
+            raise IndexError("Pixel index out of range")
+        return key
+
+    def _store(self, key, pixel):
+        """Copy an encoded pixel into the frame buffer, marking it dirty if
+        it changed"""
+        bpp = self._bpp
+        offset = key * bpp
+        buf = self._buffer
+        for i in range(bpp):
+            if buf[offset + i] != pixel[i]:
+                buf[offset:offset + bpp] = pixel
+                if not self._dirty[key]:
+                    self._dirty[key] = 1
+                    self._dirty_count += 1
+                return
+
+    def invalidate(self):
+        """Mark every pixel dirty so the next `show` resends the whole frame,
+        for example after the seesaw has been reset"""
+        for i in range(self._n):
+            self._dirty[i] = 1
+        self._dirty_count = self._n
 
-        self._seesaw.write(_NEOPIXEL_BASE, _NEOPIXEL_BUF, cmd)
+    def __setitem__(self, key, color):
+        """Set one pixel to a new value. Only the frame buffer is touched
+        until `show` runs."""
+        key = self._index(key)
+        self._pre_brightness_color[key] = color
+        self._store(key, self._encode(color))
         if self.auto_write:
             self.show()
 
     def __getitem__(self, key):
-        pass
+        """The color of one pixel as an (r, g, b) or (r, g, b, w) tuple, as
+        held in the frame buffer after brightness scaling"""
+        key = self._index(key)
+        offset = key * self._bpp
+        order = self._pixel_order
+        buf = self._buffer
+        if self._bpp == 4:
+            return (
+                buf[offset + order[0]],
+                buf[offset + order[1]],
+                buf[offset + order[2]],
+                buf[offset + order[3]],
+            )
+        return (buf[offset + order[0]], buf[offset + order[1]], buf[offset + order[2]])
+
+    def load(self, frame):
+        """Replace the whole frame with an already encoded one, such as a
+        frame rendered by `rainbowio.render_gradient`. Pixels whose bytes
+        changed are marked dirty. Brightness is not applied; render the frame
+        with `brightness_scale`."""
+        buf = self._buffer
+        if len(frame) != len(buf):
+            raise ValueError("Frame must be {} bytes".format(len(buf)))
+        bpp = self._bpp
+        dirty = self._dirty
+        offset = 0
+        for i in range(self._n):
+            self._pre_brightness_color[i] = None
+            if not dirty[i]:
+                for j in range(offset, offset + bpp):
+                    if buf[j] != frame[j]:
+                        dirty[i] = 1
+                        self._dirty_count += 1
+                        break
+            offset += bpp
+        buf[:] = frame
+        if self.auto_write:
+            self.show()
 
     def fill(self, color):
         """Set all pixels to the same value"""
-        # Suppress auto_write while filling.
-        current_auto_write = self.auto_write
-        self.auto_write = False
+        pixel = self._encode(color)
         for i in range(self._n):
-            self[i] = color
-        if current_auto_write:
+            self._pre_brightness_color[i] = color
+            self._store(i, pixel)
+        if self.auto_write:
             self.show()
-        self.auto_write = current_auto_write
 
     def show(self):
-        """Update the pixels even if auto_write is False"""
-        self._seesaw.write(_NEOPIXEL_BASE, _NEOPIXEL_SHOW)
\ No newline at end of file
+        """Update the pixels even if auto_write is False. Only the dirty
+        spans of the frame are sent, and nothing at all if no pixel changed."""
+        if not self._dirty_count:
+            self.frames_skipped += 1
+            return
+
+        bpp = self._bpp
+        dirty = self._dirty
+        start = -1
+        end = 0
+        for i in range(self._n):
+            if not dirty[i]:
+                continue
+            dirty[i] = 0
+            if start >= 0 and (i * bpp) - end > _SPAN_MERGE_GAP:
+                self._send_span(start, end)
+                start = -1
+            if start < 0:
+                start = i * bpp
+            end = (i + 1) * bpp
+        self._send_span(start, end)
+        self._dirty_count = 0
+
+        self._seesaw.write(_NEOPIXEL_BASE, _NEOPIXEL_SHOW)
+        self.frames_sent += 1
+
+    def _send_span(self, start, end):
+        self._seesaw.write_buffer(
+            _NEOPIXEL_BASE, _NEOPIXEL_BUF, start, self._buffer_mv[start:end]
+        )